@@ -1,20 +1,32 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask.json.provider import DefaultJSONProvider
+import io
 import json
 import os
+from itertools import islice
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import send_from_directory
 from services.reason_service import ReasonService
 from services.application_service import ApplicationService
 from services.user_service import UserService
+from services.customer_suggest_service import CustomerSuggestService
+from services.export_service import ExportService, EXPORT_FORMATS
+from services.import_service import CustomerImportService
 from dao.CustomerDAO import CustomerDAO
 from dao.RecoveryApplicationDAO import RecoveryApplicationDAO
 from dao.DefaultApplicationDAO import DefaultApplicationDAO
 from dao.DefaultReasonDAO import DefaultReasonDAO
 from dao.RecoveryReasonDAO import RecoveryReasonDAO
 from dao.UserDAO import UserDAO
-from config import SERVER_CONFIG
+from db.pool import get_pool
+from db.base import ConflictError, FETCH_BATCH_SIZE
+from db.pagination import decode_cursor, encode_cursor, next_cursor
+from db.projection import (
+    STATUS_MAP, to_db_status,
+    DEFAULT_REVIEW_PROJECTION, DEFAULT_APPLICATION_PROJECTION, RECOVERY_APPLICATION_PROJECTION
+)
+from config import SERVER_CONFIG, CACHE_CONFIG, SUGGEST_CONFIG, CLAIM_CONFIG
 from flask_cors import CORS
 
 # 文件上传配置
@@ -25,11 +37,87 @@ ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'doc', 'docx',
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
+# 分页配置：单页最大条数
+MAX_PAGE_SIZE = 500
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def parse_page_args():
+    """
+    解析键集分页参数 limit/cursor
+    :return: (limit, cursor)，未传 limit 时不分页
+    :raises ValueError: 参数非法
+    """
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+    if limit is None or limit == '':
+        if cursor:
+            raise ValueError("使用 cursor 时必须同时指定 limit")
+        return None, None
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError("limit 必须是整数")
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit 取值范围为 1-{MAX_PAGE_SIZE}")
+    return limit, decode_cursor(cursor) if cursor else None
+
+
+def page_response(data, limit, cursor):
+    """构造列表响应，分页时附带下一页游标"""
+    body = {'success': True, 'data': data}
+    if limit:
+        body['nextCursor'] = cursor
+    return jsonify(body)
+
+
+def wants_stream():
+    """是否要求流式输出列表（?stream=1）"""
+    return request.args.get('stream', '').lower() in ('1', 'true')
+
+
+def stream_response(rows, project, limit=None, cursor_key=None):
+    """
+    流式输出列表响应：按批读取、映射、序列化，内存占用与结果集大小无关
+    响应结构与 page_response 相同，分页时 nextCursor 在 data 之后输出
+    :param rows: 行迭代器（DAO 的 iter_* 方法），响应结束或客户端断开时关闭
+    :param project: 将一批行映射为响应数据列表的函数
+    :param cursor_key: 从一行中取出排序键元组的函数（分页时使用）
+    """
+    batches = iter(lambda: list(islice(rows, FETCH_BATCH_SIZE)), [])
+    try:
+        # 先读取第一批：查询失败时还能返回错误状态码
+        first = next(batches, None)
+    except RuntimeError as e:
+        rows.close()
+        return jsonify({'success': False, 'message': f'查询失败: {str(e)}'}), 500
+
+    def generate():
+        try:
+            yield '{"success": true, "data": ['
+            count = 0
+            last = None
+            batch = first
+            while batch:
+                items = ','.join(json.dumps(item, ensure_ascii=False, default=str) for item in project(batch))
+                yield (',' + items) if count else items
+                count += len(batch)
+                last = batch[-1]
+                batch = next(batches, None)
+            yield ']'
+            if limit:
+                cursor = encode_cursor(*cursor_key(last)) if count >= limit else None
+                yield f', "nextCursor": {json.dumps(cursor)}'
+            yield '}'
+        finally:
+            rows.close()
+
+    return Response(generate(), mimetype='application/json')
+
+
 # 自定义JSON提供器，解决中文显示问题
 class CustomJSONProvider(DefaultJSONProvider):
     def dumps(self, obj, **kwargs):
@@ -51,6 +139,9 @@ app.json = CustomJSONProvider(app)
 # 设置全局响应头，强制UTF-8编码
 @app.after_request
 def after_request(response):
+    # 导出文件保留自身的响应类型
+    if response.mimetype in EXPORT_FORMATS.values():
+        return response
     response.headers['Content-Type'] = 'application/json; charset=utf-8'
     return response
 
@@ -59,6 +150,13 @@ def after_request(response):
 reason_service = ReasonService()
 application_service = ApplicationService()
 user_service = UserService()
+customer_suggest_service = CustomerSuggestService()
+export_service = ExportService()
+customer_import_service = CustomerImportService()
+
+# 按配置预热客户缓存
+if CACHE_CONFIG['customer_warm_up']:
+    CustomerDAO.warm_cache()
 
 
 # 文件上传接口
@@ -313,20 +411,85 @@ def get_recovery_reason(reason_id):
 # 客户列表接口
 @app.route('/api/customers', methods=['GET'])
 def list_customers():
-    customers = CustomerDAO.list_all()
-    return jsonify({
-        'success': True,
-        'data': [c.to_dict() for c in customers]
-    })
+    try:
+        limit, cursor = parse_page_args()
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    if wants_stream():
+        return stream_response(
+            CustomerDAO.iter_all(limit=limit, cursor=cursor), lambda batch: [c.to_dict() for c in batch],
+            limit, lambda c: (c.create_time, c.customer_id)
+        )
+    customers = CustomerDAO.list_all(limit=limit, cursor=cursor)
+    return page_response(
+        [c.to_dict() for c in customers], limit,
+        next_cursor(customers, limit, lambda c: (c.create_time, c.customer_id))
+    )
+
+
+@app.route('/api/customers/suggest', methods=['GET'])
+def suggest_customers():
+    """客户联想：按客户ID或名称前缀匹配，最多返回 limit 条"""
+    query = request.args.get('q') or ''
+    try:
+        limit = int(request.args.get('limit') or SUGGEST_CONFIG['default_limit'])
+    except ValueError:
+        return jsonify({'success': False, 'message': 'limit 必须是整数'}), 400
+    limit = max(1, min(limit, SUGGEST_CONFIG['max_limit']))
+    customers = customer_suggest_service.suggest(query, limit)
+    return jsonify({'success': True, 'data': customers})
+
+
+@app.route('/api/customers/import', methods=['POST'])
+def import_customers():
+    """批量导入客户（multipart 上传 CSV 文件，字段 file；可选 chunkSize），只写入新增或有变化的客户"""
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        return jsonify({'success': False, 'message': '没有上传文件'}), 400
+    try:
+        chunk_size = int(request.form.get('chunkSize') or 0) or None
+    except ValueError:
+        return jsonify({'success': False, 'message': 'chunkSize 必须是整数'}), 400
+    # 上传内容按行流式读取，utf-8-sig 兼容 Excel 导出的带 BOM 文件
+    stream = io.TextIOWrapper(file.stream, encoding='utf-8-sig', newline='')
+    try:
+        result = customer_import_service.import_csv(stream, chunk_size)
+    except (ValueError, UnicodeDecodeError) as e:
+        return jsonify({'success': False, 'message': f'CSV 格式错误: {str(e)}'}), 400
+    except RuntimeError as e:
+        return jsonify({'success': False, 'message': f'导入失败: {str(e)}'}), 500
+    return jsonify({'success': True, 'data': result})
 
 
 @app.route('/api/customers/defaulted', methods=['GET'])
 def list_defaulted_customers():
-    customers = CustomerDAO.list_defaulted()
-    return jsonify({
-        'success': True,
-        'data': [c.to_dict() for c in customers]
-    })
+    try:
+        limit, cursor = parse_page_args()
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    if wants_stream():
+        return stream_response(
+            CustomerDAO.iter_defaulted(limit=limit, cursor=cursor), lambda batch: [c.to_dict() for c in batch],
+            limit, lambda c: (c.update_time, c.customer_id)
+        )
+    customers = CustomerDAO.list_defaulted(limit=limit, cursor=cursor)
+    return page_response(
+        [c.to_dict() for c in customers], limit,
+        next_cursor(customers, limit, lambda c: (c.update_time, c.customer_id))
+    )
+
+
+# 运行指标接口
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """连接池、缓存等运行时指标"""
+    return jsonify({'success': True, 'data': {
+        'db_pool': get_pool().stats(),
+        'default_reason_cache': DefaultReasonDAO.cache_stats(),
+        'recovery_reason_cache': RecoveryReasonDAO.cache_stats(),
+        'user_cache': UserDAO.cache_stats(),
+        'customer_cache': CustomerDAO.cache_stats()
+    }})
 
 
 # 违约审核列表（真实数据，支持多条件筛选）
@@ -339,58 +502,33 @@ def default_reviews():
     start_date = request.args.get('startDate')
     end_date = request.args.get('endDate')
     reviewer = request.args.get('reviewer')
+    try:
+        limit, cursor = parse_page_args()
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     
-    # 状态映射
-    status_map = {
-        'pending': '待审核',
-        'approved': '同意',
-        'rejected': '拒绝'
-    }
-    
-    # 转换状态参数
-    if status and status in status_map:
-        status = status_map[status]
-    
-    # 使用多条件查询
-    apps = DefaultApplicationDAO.list_with_filters(
+    filters = dict(
         customer_name=customer_name,
-        status=status,
+        status=to_db_status(status),
         start_date=start_date,
         end_date=end_date,
-        reviewer=reviewer
+        reviewer=reviewer,
+        limit=limit,
+        cursor=cursor
     )
+    if wants_stream():
+        return stream_response(
+            DefaultApplicationDAO.iter_reviews(**filters), DEFAULT_REVIEW_PROJECTION.project_all,
+            limit, lambda r: (r['apply_time'], r['app_id'])
+        )
     
-    # 映射后端字段到前端所需
-    data = []
-    for app in apps:
-        # 获取客户名称
-        customer = CustomerDAO.get_by_id(app.customer_id)
-        customer_name = customer.customer_name if customer else app.customer_id
-        
-        # 获取违约原因内容
-        reason = DefaultReasonDAO.get_by_id(app.default_reason_id)
-        reason_content = reason.reason_content if reason else app.default_reason_id
-        
-        # 获取审核人名称
-        reviewer_name = ''
-        if app.auditor_id:
-            auditor = UserDAO.get_by_id(app.auditor_id)
-            reviewer_name = auditor.real_name if auditor else app.auditor_id
-        
-        data.append({
-            'id': app.app_id,
-            'applicationId': app.app_id,
-            'customerName': customer_name,
-            'reasons': [reason_content],
-            'severity': app.severity_level,
-            'applyTime': app.apply_time,
-            'status': 'pending' if app.audit_status == '待审核' else ('approved' if app.audit_status == '同意' else 'rejected'),
-            'reviewer': reviewer_name,
-            'reviewTime': app.audit_time or '',
-            'reviewRemark': app.audit_remarks or ''
-        })
+    # 使用多条件查询（关联客户、违约原因、审核人，一次查询完成）
+    rows = DefaultApplicationDAO.list_reviews(**filters)
     
-    return jsonify({'success': True, 'data': data})
+    return page_response(
+        DEFAULT_REVIEW_PROJECTION.project_all(rows), limit,
+        next_cursor(rows, limit, lambda r: (r['apply_time'], r['app_id']))
+    )
 
 
 # 选项接口（严重性、状态）
@@ -509,6 +647,21 @@ def create_default_application():
     return jsonify({'success': False, 'message': '违约申请创建失败'}), 500
 
 
+@app.route('/api/default-applications/batch', methods=['POST'])
+def create_default_applications():
+    """批量创建违约认定申请（applications 为申请列表，字段同单条创建），返回逐条结果"""
+    data = request.json or {}
+    items = data.get('applications')
+    if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+        return jsonify({'success': False, 'message': 'applications 必须是非空的申请列表'}), 400
+    if len(items) > MAX_PAGE_SIZE:
+        return jsonify({'success': False, 'message': f'单次最多创建 {MAX_PAGE_SIZE} 条'}), 400
+    success, result = application_service.create_default_applications(items)
+    if success:
+        return jsonify({'success': True, 'data': result})
+    return jsonify({'success': False, 'message': result or '违约申请创建失败'}), 500
+
+
 @app.route('/api/default-applications', methods=['GET'])
 def list_default_applications():
     """获取违约申请列表，支持筛选"""
@@ -517,69 +670,53 @@ def list_default_applications():
     status = request.args.get('status')
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
+    try:
+        limit, cursor = parse_page_args()
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
     
-    # 状态映射
-    status_map = {
-        'pending': '待审核',
-        'approved': '同意',
-        'rejected': '拒绝'
-    }
-    
-    # 转换状态参数
-    if status and status in status_map:
-        status = status_map[status]
-    
-    # 获取申请列表
-    applications = application_service.get_default_applications(
+    filters = dict(
         customer_id=customer_id,
-        status=status,
+        status=to_db_status(status),
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        limit=limit,
+        cursor=cursor
     )
+    if wants_stream():
+        return stream_response(
+            DefaultApplicationDAO.iter_with_filters(**filters), project_default_applications,
+            limit, lambda r: (r['apply_time'], r['app_id'])
+        )
     
-    # 映射数据格式
-    data = []
-    for app in applications:
-        # 获取客户名称
-        customer = CustomerDAO.get_by_id(app.customer_id)
-        customer_name = customer.customer_name if customer else app.customer_id
-        
-        # 获取违约原因内容
-        reason = DefaultReasonDAO.get_by_id(app.default_reason_id)
-        reason_content = reason.reason_content if reason else app.default_reason_id
-        
-        # 获取申请人名称
-        applicant = UserDAO.get_by_id(app.applicant_id)
-        applicant_name = applicant.real_name if applicant else app.applicant_id
-        
-        # 获取审核人名称
-        reviewer_name = ''
-        if app.auditor_id:
-            auditor = UserDAO.get_by_id(app.auditor_id)
-            reviewer_name = auditor.real_name if auditor else app.auditor_id
-        
-        data.append({
-            'id': app.app_id,
-            'applicationId': app.app_id,
-            'customerName': customer_name,
-            'customerId': app.customer_id,
-            'reasons': [reason_content],
-            'reasonId': app.default_reason_id,
-            'severity': app.severity_level,
-            'remarks': app.remarks or '',
-            'applicant': applicant_name,
-            'applicantId': app.applicant_id,
-            'applyTime': app.apply_time,
-            'status': 'pending' if app.audit_status == '待审核' else ('approved' if app.audit_status == '同意' else 'rejected'),
-            'auditStatus': app.audit_status,
-            'reviewer': reviewer_name,
-            'reviewerId': app.auditor_id,
-            'reviewTime': app.audit_time or '',
-            'reviewRemark': app.audit_remarks or '',
-            'attachmentUrl': app.attachment_url or ''
-        })
+    # 获取申请列表（行字典，直接投影为响应）
+    rows = application_service.get_default_applications(as_rows=True, **filters)
+    return page_response(
+        project_default_applications(rows), limit,
+        next_cursor(rows, limit, lambda r: (r['apply_time'], r['app_id']))
+    )
+
+
+def project_default_applications(rows):
+    """违约申请行补充客户名称、违约原因、申请人和审核人姓名后投影为响应"""
+    # 批量获取关联的客户、违约原因、申请人和审核人（每类一次查询，均走缓存）
+    customers = CustomerDAO.get_many(row['customer_id'] for row in rows)
+    reasons = DefaultReasonDAO.get_many(row['default_reason_id'] for row in rows)
+    users = UserDAO.get_many(
+        [row['applicant_id'] for row in rows] + [row['auditor_id'] for row in rows]
+    )
     
-    return jsonify({'success': True, 'data': data})
+    # 关联名称补充到行中，关联不到时为 None（投影时回退为ID）
+    for row in rows:
+        customer = customers.get(row['customer_id'])
+        reason = reasons.get(row['default_reason_id'])
+        applicant = users.get(row['applicant_id'])
+        auditor = users.get(row['auditor_id']) if row['auditor_id'] else None
+        row['customer_name'] = customer.customer_name if customer else None
+        row['reason_content'] = reason.reason_content if reason else None
+        row['applicant_name'] = applicant.real_name if applicant else None
+        row['auditor_name'] = auditor.real_name if auditor else None
+    return DEFAULT_APPLICATION_PROJECTION.project_all(rows)
 
 
 @app.route('/api/default-applications/<app_id>', methods=['GET'])
@@ -611,22 +748,118 @@ def get_default_application(app_id):
         'auditorId': application.auditor_id,
         'auditorName': auditor.real_name if auditor else (application.auditor_id or ''),
         'auditTime': application.audit_time or '',
-        'auditRemarks': application.audit_remarks or ''
+        'auditRemarks': application.audit_remarks or '',
+        'version': application.version
     }
     
     return jsonify({'success': True, 'data': data})
 
 
+@app.route('/api/default-applications/audit-batch', methods=['POST'])
+def audit_default_applications():
+    """批量审核违约认定申请（app_ids 为申请ID列表，其余字段同单条审核），返回逐条结果"""
+    return audit_batch_response(application_service.audit_default_applications)
+
+
+def audit_batch_response(audit):
+    """
+    批量审核接口的公共处理
+    :param audit: 批量审核服务方法
+    """
+    data = request.json or {}
+    app_ids = data.get('app_ids')
+    if not isinstance(app_ids, list) or not app_ids:
+        return jsonify({'success': False, 'message': 'app_ids 必须是非空列表'}), 400
+    if len(app_ids) > MAX_PAGE_SIZE:
+        return jsonify({'success': False, 'message': f'单次最多审核 {MAX_PAGE_SIZE} 条'}), 400
+    try:
+        success, result = audit(
+            app_ids,
+            auditor_id=data.get('auditor_id'),
+            audit_status=data.get('audit_status'),
+            audit_remarks=data.get('audit_remarks')
+        )
+    except ConflictError as e:
+        # 校验之后有申请被其他审核人修改、审核或领取，整体未更新；data 中列出这些申请ID
+        return jsonify({'success': False, 'message': str(e), 'data': {'conflict_ids': e.ids}}), 409
+    if success:
+        return jsonify({'success': True, 'data': result})
+    return jsonify({'success': False, 'message': result or '审核失败'}), 500
+
+
+@app.route('/api/default-applications/claim', methods=['POST'])
+def claim_default_applications():
+    """
+    领取一批待审核的违约申请（按申请时间先后，跳过其他审核人正在领取的申请）
+    请求体: {auditor_id, limit}；领取在租约到期前有效，到期未审核的申请可被其他审核人重新领取
+    """
+    data = request.json or {}
+    auditor_id = data.get('auditor_id')
+    if not auditor_id:
+        return jsonify({'success': False, 'message': 'auditor_id 不能为空'}), 400
+    try:
+        limit = int(data.get('limit') or CLAIM_CONFIG['default_limit'])
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'limit 必须是整数'}), 400
+    limit = max(1, min(limit, CLAIM_CONFIG['max_limit']))
+    success, result = application_service.claim_default_applications(auditor_id, limit)
+    if not success:
+        status_code = 404 if "不存在" in result else 500
+        return jsonify({'success': False, 'message': result}), status_code
+    return jsonify({
+        'success': True,
+        'data': DEFAULT_REVIEW_PROJECTION.project_all(result),
+        'leaseSeconds': CLAIM_CONFIG['lease_seconds']
+    })
+
+
+@app.route('/api/default-applications/release', methods=['POST'])
+def release_default_applications():
+    """释放领取的违约申请（请求体: {auditor_id, app_ids}，不传 app_ids 时释放该审核人领取的全部申请）"""
+    data = request.json or {}
+    auditor_id = data.get('auditor_id')
+    if not auditor_id:
+        return jsonify({'success': False, 'message': 'auditor_id 不能为空'}), 400
+    app_ids = data.get('app_ids')
+    if app_ids is not None and not isinstance(app_ids, list):
+        return jsonify({'success': False, 'message': 'app_ids 必须是列表'}), 400
+    if app_ids is not None and len(app_ids) > MAX_PAGE_SIZE:
+        return jsonify({'success': False, 'message': f'单次最多释放 {MAX_PAGE_SIZE} 条'}), 400
+    success, result = application_service.release_default_applications(auditor_id, app_ids)
+    if not success:
+        return jsonify({'success': False, 'message': result}), 500
+    return jsonify({'success': True, 'data': {'released': result}})
+
+
+def parse_version(data):
+    """解析审核请求中的乐观锁版本号（可选）；非整数时抛出 ValueError"""
+    version = data.get('version')
+    if version is None:
+        return None
+    try:
+        return int(version)
+    except (TypeError, ValueError):
+        raise ValueError('version 必须是整数')
+
+
 @app.route('/api/default-applications/<app_id>/audit', methods=['POST'])
 def audit_default_application(app_id):
-    """审核违约认定申请"""
+    """审核违约认定申请（可传 version：详情接口返回的版本号，申请已被他人修改时返回 409）"""
     data = request.json
-    success, message = application_service.audit_default_application(
-        app_id=app_id,
-        auditor_id=data.get('auditor_id'),
-        audit_status=data.get('audit_status'),
-        audit_remarks=data.get('audit_remarks')
-    )
+    try:
+        version = parse_version(data)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    try:
+        success, message = application_service.audit_default_application(
+            app_id=app_id,
+            auditor_id=data.get('auditor_id'),
+            audit_status=data.get('audit_status'),
+            audit_remarks=data.get('audit_remarks'),
+            version=version
+        )
+    except ConflictError as e:
+        return jsonify({'success': False, 'message': str(e)}), 409
 
     if success:
         return jsonify({'success': True, 'message': '审核成功'})
@@ -658,16 +891,30 @@ def create_recovery_application():
         return jsonify({'success': False, 'message': f'创建重生申请失败: {str(e)}'}), 500
 
 
+@app.route('/api/recovery-applications/audit-batch', methods=['POST'])
+def audit_recovery_applications():
+    """批量审核重生申请（app_ids 为重生申请ID列表，其余字段同单条审核），返回逐条结果"""
+    return audit_batch_response(application_service.audit_recovery_applications)
+
+
 @app.route('/api/recovery-applications/<app_id>/audit', methods=['POST'])
 def audit_recovery_application(app_id):
-    """审核重生申请"""
+    """审核重生申请（可传 version：列表接口返回的版本号，申请已被他人修改时返回 409）"""
     data = request.json
-    success, message = application_service.audit_recovery_application(
-        recovery_app_id=app_id,
-        auditor_id=data.get('auditor_id'),
-        audit_status=data.get('audit_status'),
-        audit_remarks=data.get('audit_remarks')
-    )
+    try:
+        version = parse_version(data)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    try:
+        success, message = application_service.audit_recovery_application(
+            recovery_app_id=app_id,
+            auditor_id=data.get('auditor_id'),
+            audit_status=data.get('audit_status'),
+            audit_remarks=data.get('audit_remarks'),
+            version=version
+        )
+    except ConflictError as e:
+        return jsonify({'success': False, 'message': str(e)}), 409
 
     if success:
         return jsonify({'success': True, 'message': '审核成功'})
@@ -676,73 +923,80 @@ def audit_recovery_application(app_id):
 
 @app.route('/api/recovery-applications', methods=['GET'])
 def list_recovery_applications():
-    """查询重生申请，可选按 status 过滤（pending/approved/rejected）"""
-    status_map = {
-        'pending': '待审核',
-        'approved': '同意',
-        'rejected': '拒绝'
-    }
+    """查询重生申请，可选按 status（pending/approved/rejected）、申请时间、客户名称、审核人过滤"""
     status = request.args.get('status')
     start_date = request.args.get('startDate')  # YYYY-MM-DD
     end_date = request.args.get('endDate')      # YYYY-MM-DD
-    if status and status in status_map:
-        apps = RecoveryApplicationDAO.list_by_status(status_map[status])
-    else:
-        apps = RecoveryApplicationDAO.list_all()
+    customer_name = request.args.get('customerName')
+    reviewer = request.args.get('reviewer')
+    try:
+        limit, cursor = parse_page_args()
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    filters = dict(
+        customer_name=customer_name,
+        status=STATUS_MAP.get(status) if status else None,
+        start_date=start_date,
+        end_date=end_date,
+        reviewer=reviewer,
+        limit=limit,
+        cursor=cursor
+    )
+    if wants_stream():
+        return stream_response(
+            RecoveryApplicationDAO.iter_enriched(**filters), RECOVERY_APPLICATION_PROJECTION.project_all,
+            limit, lambda r: (r['apply_time'], r['recovery_app_id'])
+        )
     
-    # 映射后端字段到前端所需
-    data = []
-    for app in apps:
-        # 申请时间范围筛选（基于重生申请 apply_time）
-        if start_date and (not app.apply_time or str(app.apply_time) < f"{start_date} 00:00:00"):
-            continue
-        if end_date and (not app.apply_time or str(app.apply_time) > f"{end_date} 23:59:59"):
-            continue
-        # 获取客户信息
-        customer = CustomerDAO.get_by_id(app.customer_id)
-        customer_name = customer.customer_name if customer else app.customer_id
-        external_level = customer.current_external_rating if customer else ''
-        
-        # 获取原违约原因
-        original_reason = ''
-        if app.original_default_app_id:
-            original_app = DefaultApplicationDAO.get_by_id(app.original_default_app_id)
-            if original_app:
-                reason = DefaultReasonDAO.get_by_id(original_app.default_reason_id)
-                original_reason = reason.reason_content if reason else original_app.default_reason_id
-                severity = original_app.severity_level
-            else:
-                severity = 'medium'
-        else:
-            severity = 'medium'
-        
-        # 获取重生原因
-        rebirth_reason = ''
-        if app.recovery_reason_id:
-            reason = RecoveryReasonDAO.get_by_id(app.recovery_reason_id)
-            rebirth_reason = reason.recovery_content if reason else app.recovery_reason_id
-        
-        # 获取审核人信息
-        reviewer_name = ''
-        if app.auditor_id:
-            auditor = UserDAO.get_by_id(app.auditor_id)
-            reviewer_name = auditor.real_name if auditor else app.auditor_id
-        
-        data.append({
-            'id': app.recovery_app_id,
-            'customerName': customer_name,
-            'originalReason': original_reason,
-            'rebirthReason': rebirth_reason,
-            'severity': severity,
-            'status': 'pending' if app.audit_status == '待审核' else ('approved' if app.audit_status == '同意' else 'rejected'),
-            'applyTime': app.apply_time,
-            'reviewer': reviewer_name,
-            'reviewTime': app.audit_time or '',
-            'reviewRemark': app.audit_remarks or '',
-            'externalLevel': external_level
-        })
+    # 关联客户、原违约申请、原因和审核人，一次查询完成（筛选与分页在 SQL 中处理）
+    rows = RecoveryApplicationDAO.list_enriched(**filters)
     
-    return jsonify({'success': True, 'data': data})
+    return page_response(
+        RECOVERY_APPLICATION_PROJECTION.project_all(rows), limit,
+        next_cursor(rows, limit, lambda r: (r['apply_time'], r['recovery_app_id']))
+    )
+
+
+# 数据导出接口
+def export_response(export, filename):
+    """
+    流式导出：?format=csv（默认）或 jsonl，筛选参数 customerId（可重复传多个）、customerName、status、
+    startDate、endDate、reviewer
+    :param export: 导出服务方法
+    """
+    fmt = (request.args.get('format') or 'csv').lower()
+    customer_ids = request.args.getlist('customerId')
+    try:
+        chunks = export(
+            fmt,
+            customer_id=customer_ids if len(customer_ids) > 1 else (customer_ids[0] if customer_ids else None),
+            customer_name=request.args.get('customerName'),
+            status=to_db_status(request.args.get('status')),
+            start_date=request.args.get('startDate'),
+            end_date=request.args.get('endDate'),
+            reviewer=request.args.get('reviewer')
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'success': False, 'message': f'导出失败: {str(e)}'}), 500
+    return Response(
+        chunks,
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename={filename}.{fmt}'}
+    )
+
+
+@app.route('/api/export/default-applications', methods=['GET'])
+def export_default_applications():
+    """导出违约申请（含客户名称、违约原因、申请人和审核人姓名）"""
+    return export_response(export_service.export_default_applications, 'default-applications')
+
+
+@app.route('/api/export/recovery-applications', methods=['GET'])
+def export_recovery_applications():
+    """导出重生申请（含客户、原违约申请、原因和审核人信息）"""
+    return export_response(export_service.export_recovery_applications, 'recovery-applications')
 
 
 # 启动应用
@@ -10,6 +10,64 @@ DB_CONFIG = {
     'charset': 'utf8mb4'
 }
 
+# 连接池配置
+POOL_CONFIG = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 20)),
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),       # 借出连接最长等待秒数
+    'recycle': int(os.getenv('DB_POOL_RECYCLE', 3600)),       # 连接最长存活秒数，应小于 MySQL wait_timeout
+    'pre_ping': os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'
+}
+
+# 缓存配置
+CACHE_CONFIG = {
+    'reason_ttl': int(os.getenv('REASON_CACHE_TTL', 300)),   # 原因字典表缓存秒数，兜底其他进程的修改
+    'user_max_size': int(os.getenv('USER_CACHE_MAX_SIZE', 10000)),
+    'user_ttl': int(os.getenv('USER_CACHE_TTL', 600)),
+    'customer_max_size': int(os.getenv('CUSTOMER_CACHE_MAX_SIZE', 100000)),
+    'customer_ttl': int(os.getenv('CUSTOMER_CACHE_TTL', 600)),
+    'customer_warm_up': os.getenv('CUSTOMER_CACHE_WARM_UP', 'False').lower() == 'true',
+}
+
+# ID 序号分配配置
+SEQUENCE_CONFIG = {
+    'block_size': int(os.getenv('SEQUENCE_BLOCK_SIZE', 20)),   # 每个进程一次预留的序号数量
+}
+
+# 名称搜索配置
+SEARCH_CONFIG = {
+    # 使用 ngram 全文索引做子串搜索（需先执行 db.schema 迁移到版本 3）
+    'fulltext': os.getenv('SEARCH_FULLTEXT', 'True').lower() == 'true',
+    # 与 MySQL 的 ngram_token_size 保持一致，短于该长度的关键词无法走全文索引
+    'ngram_token_size': int(os.getenv('SEARCH_NGRAM_TOKEN_SIZE', 2)),
+}
+
+# 客户联想搜索配置
+SUGGEST_CONFIG = {
+    'refresh_interval': int(os.getenv('SUGGEST_REFRESH_INTERVAL', 5)),       # 增量刷新最小间隔（秒）
+    'full_refresh_interval': int(os.getenv('SUGGEST_FULL_REFRESH_INTERVAL', 3600)),  # 全量重建间隔（秒），删除的客户在重建时移除
+    'initial_load_timeout': float(os.getenv('SUGGEST_INITIAL_LOAD_TIMEOUT', 3)),  # 首次加载时查询最多等待（秒）
+    'default_limit': 10,
+    'max_limit': 50,
+}
+
+# 流式读取配置
+STREAM_CONFIG = {
+    'fetch_size': int(os.getenv('STREAM_FETCH_SIZE', 1000)),   # 服务端游标每批读取的行数
+}
+
+# 批量导入配置
+IMPORT_CONFIG = {
+    'chunk_size': int(os.getenv('IMPORT_CHUNK_SIZE', 1000)),   # 每批比对、写入的行数
+}
+
+# 审核队列配置
+CLAIM_CONFIG = {
+    'lease_seconds': int(os.getenv('CLAIM_LEASE_SECONDS', 900)),   # 领取后的租约时长，超时未审核自动释放
+    'default_limit': 10,
+    'max_limit': 50,
+}
+
 # 服务器配置
 SERVER_CONFIG = {
     'host': os.getenv('SERVER_HOST', '0.0.0.0'),
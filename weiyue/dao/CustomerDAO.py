@@ -1,31 +1,126 @@
-from db.base import Database
+from db.base import Database, FETCH_BATCH_SIZE, IN_CHUNK_SIZE, iter_query
+from db.pagination import keyset_clause
 from db.models import (
     DefaultReason, RecoveryReason, CustomerInfo,
     DefaultApplication, RecoveryApplication, UserInfo,
-    dict_to_model
+    dict_to_model, row_mapper, format_row
 )
 from datetime import datetime
+from functools import lru_cache
+from db.cache import VersionedCache
+from config import CACHE_CONFIG
+
+# 可批量导入（新增或更新）的客户字段
+IMPORT_COLUMNS = ('customer_name', 'current_external_rating', 'industry_type', 'region')
+
+
+def _with_default_status(customer, is_default, update_time):
+    """复制一份更新了违约状态的客户对象（缓存中的对象不做原地修改）"""
+    data = customer.to_dict()
+    data['is_default'] = is_default
+    data['update_time'] = update_time
+    return CustomerInfo(**data)
+
+
+def _list_all_query(limit=None, cursor=None):
+    """全部客户，按 (create_time, customer_id) 倒序键集分页"""
+    sql = "SELECT * FROM t_customer_info"
+    params = []
+    if cursor:
+        clause, params = keyset_clause("create_time", "customer_id", cursor)
+        sql += f" WHERE {clause}"
+    sql += " ORDER BY create_time DESC, customer_id DESC"
+    if limit:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return sql, params
+
+
+def _list_defaulted_query(limit=None, cursor=None):
+    """已违约客户，按 (update_time, customer_id) 倒序键集分页"""
+    sql = "SELECT * FROM t_customer_info WHERE is_default = 1"
+    params = []
+    if cursor:
+        # update_time 可能为空，倒序时空值排在最后
+        clause, params = keyset_clause("update_time", "customer_id", cursor, nullable=True)
+        sql += f" AND {clause}"
+    sql += " ORDER BY update_time DESC, customer_id DESC"
+    if limit:
+        sql += " LIMIT %s"
+        params.append(limit)
+    return sql, params
+
+
+@lru_cache(maxsize=32)
+def _upsert_sql(columns):
+    """
+    批量导入客户的 INSERT ... ON DUPLICATE KEY UPDATE 语句
+    VALUES 中只能是占位符（新客户的 is_default 也作为参数传入），驱动才会把 executemany 合并为一条多行语句
+    """
+    return f"""
+    INSERT INTO t_customer_info
+    (customer_id, {', '.join(columns)}, is_default, create_time, update_time)
+    VALUES (%s, {', '.join(['%s'] * len(columns))}, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE {', '.join(f'{c} = VALUES({c})' for c in columns)},
+    update_time = VALUES(update_time)
+    """
+
 
 class CustomerDAO:
     """客户信息数据访问对象"""
     
+    _cache = VersionedCache(max_size=CACHE_CONFIG['customer_max_size'], ttl=CACHE_CONFIG['customer_ttl'])
+    
     @staticmethod
     def get_by_id(customer_id):
-        """根据ID获取客户信息"""
+        """根据ID获取客户信息（走写穿透缓存）"""
+        customer = CustomerDAO._cache.get(customer_id)
+        if customer is not None:
+            return customer
+        version = CustomerDAO._cache.read_version()
         db = Database()
         try:
             sql = "SELECT * FROM t_customer_info WHERE customer_id = %s"
             success, msg = db.execute(sql, (customer_id,))
             if success:
                 row = db.fetchone()
-                return dict_to_model(row, CustomerInfo)
+                customer = dict_to_model(row, CustomerInfo)
+                if customer:
+                    CustomerDAO._cache.put_if_fresh(customer_id, customer, version)
+                return customer
             return None
         finally:
             db.close()
     
+    @staticmethod
+    def get_many(customer_ids):
+        """根据ID集合批量获取客户信息，返回以ID为键的字典（未命中缓存的部分一次批量查询）"""
+        result = {}
+        missing = []
+        for customer_id in dict.fromkeys(k for k in customer_ids if k is not None):
+            customer = CustomerDAO._cache.get(customer_id)
+            if customer is not None:
+                result[customer_id] = customer
+            else:
+                missing.append(customer_id)
+        if not missing:
+            return result
+        version = CustomerDAO._cache.read_version()
+        db = Database()
+        try:
+            success, rows = db.select_in("t_customer_info", "customer_id", missing)
+            if success:
+                for row in rows:
+                    customer = dict_to_model(row, CustomerInfo)
+                    CustomerDAO._cache.put_if_fresh(customer.customer_id, customer, version)
+                    result[customer.customer_id] = customer
+            return result
+        finally:
+            db.close()
+    
     @staticmethod
     def update_default_status(customer_id, is_default):
-        """更新客户违约状态"""
+        """更新客户违约状态（提交后同步写入缓存）"""
         db = Database()
         try:
             sql = """
@@ -37,6 +132,9 @@ class CustomerDAO:
             success, msg = db.execute(sql, (is_default, now, customer_id))
             if success:
                 db.commit()
+                db.after_commit(lambda: CustomerDAO._cache.write(
+                    customer_id, lambda c: _with_default_status(c, is_default, now)
+                ))
                 return True
             db.rollback()
             return False
@@ -44,29 +142,186 @@ class CustomerDAO:
             db.close()
 
     @staticmethod
-    def list_all():
-        """获取所有客户信息"""
+    def update_default_status_many(customer_ids, is_default):
+        """批量更新客户违约状态（每批一条 UPDATE ... IN，提交后同步写入缓存）"""
+        customer_ids = list(dict.fromkeys(customer_ids))
+        db = Database()
+        try:
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for i in range(0, len(customer_ids), IN_CHUNK_SIZE):
+                chunk = customer_ids[i:i + IN_CHUNK_SIZE]
+                sql = f"""
+                UPDATE t_customer_info
+                SET is_default = %s, update_time = %s
+                WHERE customer_id IN ({', '.join(['%s'] * len(chunk))})
+                """
+                success, msg = db.execute(sql, [is_default, now] + chunk)
+                if not success:
+                    db.rollback()
+                    return False
+            db.commit()
+            db.after_commit(lambda: CustomerDAO._write_default_status_many(customer_ids, is_default, now))
+            return True
+        finally:
+            db.close()
+
+    @staticmethod
+    def warm_cache(limit=None):
+        """
+        批量预热客户缓存（按更新时间倒序装入，最多装满缓存容量）
+        :return: 装入的客户数量
+        """
+        limit = min(limit or CustomerDAO._cache.max_size, CustomerDAO._cache.max_size)
+        version = CustomerDAO._cache.read_version()
         db = Database()
         try:
-            sql = "SELECT * FROM t_customer_info ORDER BY create_time DESC"
-            success, msg = db.execute(sql)
+            sql = "SELECT * FROM t_customer_info ORDER BY update_time DESC LIMIT %s"
+            success, msg = db.execute(sql, (limit,))
+            if not success:
+                return 0
+            loaded = 0
+            for row in db.fetchall():
+                customer = dict_to_model(row, CustomerInfo)
+                if CustomerDAO._cache.put_if_fresh(customer.customer_id, customer, version):
+                    loaded += 1
+            return loaded
+        finally:
+            db.close()
+
+    @staticmethod
+    def invalidate_cache(customer_id=None):
+        """客户信息被其他途径修改后调用；customer_id 为 None 时清空"""
+        CustomerDAO._cache.invalidate(customer_id)
+
+    @staticmethod
+    def _write_default_status_many(customer_ids, is_default, update_time):
+        for customer_id in customer_ids:
+            CustomerDAO._cache.write(
+                customer_id, lambda c: _with_default_status(c, is_default, update_time)
+            )
+
+    @staticmethod
+    def _invalidate_many(customer_ids):
+        for customer_id in customer_ids:
+            CustomerDAO._cache.invalidate(customer_id)
+
+    @staticmethod
+    def cache_stats():
+        """缓存命中统计"""
+        return CustomerDAO._cache.stats()
+
+    @staticmethod
+    def list_all(limit=None, cursor=None):
+        """
+        获取所有客户信息
+        :param limit: 每页条数，None 表示不分页
+        :param cursor: 上一页最后一条的 (create_time, customer_id)，按键集分页
+        """
+        db = Database()
+        try:
+            success, msg = db.execute(*_list_all_query(limit, cursor))
             if success:
                 results = db.fetchall()
-                return [dict_to_model(row, CustomerInfo) for row in results]
+                return list(map(row_mapper(CustomerInfo), results))
             return []
         finally:
             db.close()
 
     @staticmethod
-    def list_defaulted():
-        """获取已违约客户"""
+    def iter_all(limit=None, cursor=None, batch_size=FETCH_BATCH_SIZE):
+        """
+        与 list_all 条件、排序相同，用服务端游标逐批读取，逐个产出客户对象
+        :raises RuntimeError: 查询失败
+        """
+        yield from iter_query(*_list_all_query(limit, cursor), batch_size=batch_size,
+                              mapper=row_mapper(CustomerInfo))
+
+    @staticmethod
+    def list_defaulted(limit=None, cursor=None):
+        """
+        获取已违约客户
+        :param limit: 每页条数，None 表示不分页
+        :param cursor: 上一页最后一条的 (update_time, customer_id)，按键集分页
+        """
         db = Database()
         try:
-            sql = "SELECT * FROM t_customer_info WHERE is_default = 1 ORDER BY update_time DESC, create_time DESC"
-            success, msg = db.execute(sql)
+            success, msg = db.execute(*_list_defaulted_query(limit, cursor))
             if success:
                 results = db.fetchall()
-                return [dict_to_model(row, CustomerInfo) for row in results]
+                return list(map(row_mapper(CustomerInfo), results))
             return []
         finally:
             db.close()
+
+    @staticmethod
+    def iter_defaulted(limit=None, cursor=None, batch_size=FETCH_BATCH_SIZE):
+        """
+        与 list_defaulted 条件、排序相同，用服务端游标逐批读取，逐个产出客户对象
+        :raises RuntimeError: 查询失败
+        """
+        yield from iter_query(*_list_defaulted_query(limit, cursor), batch_size=batch_size,
+                              mapper=row_mapper(CustomerInfo))
+
+    @staticmethod
+    def list_search_fields(changed_since=None):
+        """
+        获取建立搜索索引所需的客户字段
+        :param changed_since: 只返回该时间（含）之后新增或修改的客户，None 表示全部
+        :return: 字典列表（customer_id、customer_name、is_default、create_time、update_time）
+        """
+        db = Database()
+        try:
+            sql = "SELECT customer_id, customer_name, is_default, create_time, update_time FROM t_customer_info"
+            params = []
+            if changed_since:
+                sql += " WHERE update_time >= %s OR create_time >= %s"
+                params = [changed_since, changed_since]
+            success, msg = db.execute(sql, params)
+            if success:
+                return [format_row(row) for row in db.fetchall()]
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def load_many(customer_ids):
+        """
+        根据ID集合直接查询数据库（不读写缓存，用于批量导入比对）
+        :return: 以ID为键的行字典；查询失败时返回 None
+        """
+        db = Database()
+        try:
+            success, rows = db.select_in("t_customer_info", "customer_id", customer_ids)
+            if success:
+                return {row['customer_id']: row for row in rows}
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def upsert_many(customers, columns=IMPORT_COLUMNS):
+        """
+        批量新增或更新客户（INSERT ... ON DUPLICATE KEY UPDATE，驱动合并为多行语句），提交后使缓存失效
+        :param customers: 字典列表，包含 customer_id 和 columns 中的字段
+        :param columns: 需要写入的字段（IMPORT_COLUMNS 的子集），已存在的客户只更新这些字段
+        :return: (success, msg)
+        """
+        if not customers:
+            return True, None
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        params = [
+            [customer['customer_id']] + [customer.get(c) for c in columns] + [0, now, now]
+            for customer in customers
+        ]
+        db = Database()
+        try:
+            success, msg = db.executemany(_upsert_sql(tuple(columns)), params)
+            if not success:
+                db.rollback()
+                return False, msg
+            db.commit()
+            customer_ids = [customer['customer_id'] for customer in customers]
+            db.after_commit(lambda: CustomerDAO._invalidate_many(customer_ids))
+            return True, None
+        finally:
+            db.close()
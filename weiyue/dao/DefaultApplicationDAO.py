@@ -1,12 +1,110 @@
-from db.base import Database
+from db.base import ConflictError, Database, FETCH_BATCH_SIZE, iter_query
+from db.filters import filter_clause, filter_joins, build_query
 from db.models import (
     DefaultReason, RecoveryReason, CustomerInfo,
     DefaultApplication, RecoveryApplication, UserInfo,
-    dict_to_model
+    dict_to_model, row_mapper, format_row
 )
 from datetime import datetime
 
 
+# 违约申请列表排序：申请时间倒序，同一时间按申请ID倒序（与键集分页游标一致）
+_ORDER_BY = "da.apply_time DESC, da.app_id DESC"
+
+
+def _filter_clause(customer_name=None, status=None, start_date=None, end_date=None, reviewer=None,
+                   cursor=None, customer_id=None):
+    """违约申请筛选条件（列表、审核列表、导出共用），见 db.filters.filter_clause"""
+    return filter_clause('da', 'app_id', customer_name, status, start_date, end_date, reviewer, cursor,
+                         customer_id)
+
+
+def _list_with_filters_query(customer_name, status, start_date, end_date, reviewer, limit, cursor,
+                             customer_id):
+    """
+    构建 list_with_filters 的查询：只在按客户名称、审核人筛选时才连接客户表、用户表，
+    仅按状态/时间筛选时为单表索引范围扫描
+    :return: (SQL, 参数列表)；按空的客户ID列表筛选时返回 None
+    """
+    select = "SELECT da.* FROM t_default_application da" + filter_joins('da', customer_name, reviewer)
+    filters = _filter_clause(customer_name, status, start_date, end_date, reviewer, cursor, customer_id)
+    return build_query(select, filters, _ORDER_BY, limit)
+
+
+# 审核列表查询：关联客户名称、违约原因内容和审核人姓名
+_REVIEWS_SELECT = """
+SELECT da.*, ci.customer_name, dr.reason_content, ui.real_name AS auditor_name
+FROM t_default_application da
+LEFT JOIN t_customer_info ci ON da.customer_id = ci.customer_id
+LEFT JOIN t_default_reason dr ON da.default_reason_id = dr.reason_id
+LEFT JOIN t_user_info ui ON da.auditor_id = ui.user_id
+"""
+
+# 导出查询：关联客户名称、违约原因内容、申请人和审核人姓名
+_ENRICHED_SELECT = """
+SELECT da.*, ci.customer_name, dr.reason_content,
+       ua.real_name AS applicant_name, ui.real_name AS auditor_name
+FROM t_default_application da
+LEFT JOIN t_customer_info ci ON da.customer_id = ci.customer_id
+LEFT JOIN t_default_reason dr ON da.default_reason_id = dr.reason_id
+LEFT JOIN t_user_info ua ON da.applicant_id = ua.user_id
+LEFT JOIN t_user_info ui ON da.auditor_id = ui.user_id
+"""
+
+# 可领取条件：未被领取、由本人领取或租约已过期
+_CLAIMABLE = "(claimed_by IS NULL OR claimed_by = %s OR claim_expires_at < NOW())"
+
+
+def _claim_query(auditor_id, limit):
+    """审核队列：锁定最早的 limit 条可由该审核人领取的待审核申请，跳过其他事务已锁定的行"""
+    sql = f"""
+    SELECT app_id FROM t_default_application
+    WHERE audit_status = '待审核' AND {_CLAIMABLE}
+    ORDER BY apply_time, app_id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+    """
+    return sql, [auditor_id, limit]
+
+
+def _claim_update(auditor_id, lease_seconds, app_ids):
+    """为领取到的申请设置领取人和租约到期时间"""
+    sql = f"""
+    UPDATE t_default_application
+    SET claimed_by = %s, claim_expires_at = NOW() + INTERVAL %s SECOND
+    WHERE app_id IN ({', '.join(['%s'] * len(app_ids))})
+    """
+    return sql, [auditor_id, lease_seconds] + list(app_ids)
+
+
+def _reviews_query(customer_name, status, start_date, end_date, reviewer, limit, cursor):
+    """
+    构建审核列表查询（关联客户、违约原因、审核人）
+    :return: (SQL, 参数列表)
+    """
+    filters = _filter_clause(customer_name, status, start_date, end_date, reviewer, cursor)
+    return build_query(_REVIEWS_SELECT, filters, _ORDER_BY, limit)
+
+
+def _get_reviews_query(app_ids):
+    """
+    构建按申请ID取审核列表行的查询（按申请时间先后排列）
+    :return: (SQL, 参数列表)
+    """
+    sql = (_REVIEWS_SELECT + f" WHERE da.app_id IN ({', '.join(['%s'] * len(app_ids))})"
+           " ORDER BY da.apply_time, da.app_id")
+    return sql, list(app_ids)
+
+
+def _enriched_query(customer_name, status, start_date, end_date, reviewer, limit, cursor, customer_id):
+    """
+    构建关联客户、违约原因、申请人和审核人的违约申请查询
+    :return: (SQL, 参数列表)；按空的客户ID列表筛选时返回 None
+    """
+    filters = _filter_clause(customer_name, status, start_date, end_date, reviewer, cursor, customer_id)
+    return build_query(_ENRICHED_SELECT, filters, _ORDER_BY, limit)
+
+
 class DefaultApplicationDAO:
     """违约认定申请数据访问对象"""
     
@@ -42,6 +140,41 @@ class DefaultApplicationDAO:
         finally:
             db.close()
     
+    @staticmethod
+    def create_many(applications):
+        """批量创建违约认定申请（executemany，驱动合并为多行 INSERT）"""
+        db = Database()
+        try:
+            sql = """
+            INSERT INTO t_default_application 
+            (app_id, customer_id, default_reason_id, severity_level, remarks,
+             attachment_url, applicant_id, apply_time, audit_status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            params = [
+                (
+                    application.app_id,
+                    application.customer_id,
+                    application.default_reason_id,
+                    application.severity_level,
+                    application.remarks,
+                    application.attachment_url,
+                    application.applicant_id,
+                    application.apply_time,
+                    application.audit_status
+                )
+                for application in applications
+            ]
+            
+            success, msg = db.executemany(sql, params)
+            if success:
+                db.commit()
+                return True, None
+            db.rollback()
+            return False, msg
+        finally:
+            db.close()
+    
     @staticmethod
     def get_by_id(app_id):
         """根据ID获取违约申请"""
@@ -55,6 +188,19 @@ class DefaultApplicationDAO:
             return None
         finally:
             db.close()
+    
+    @staticmethod
+    def get_many(app_ids):
+        """根据ID集合批量获取违约申请，返回以ID为键的字典"""
+        db = Database()
+        try:
+            success, rows = db.select_in("t_default_application", "app_id", app_ids)
+            if success:
+                map_row = row_mapper(DefaultApplication)
+                return {row['app_id']: map_row(row) for row in rows}
+            return {}
+        finally:
+            db.close()
 
     @staticmethod
     def get_latest_by_customer(customer_id):
@@ -75,22 +221,137 @@ class DefaultApplicationDAO:
             db.close()
     
     @staticmethod
-    def update_audit_status(app_id, auditor_id, audit_status, audit_remarks):
-        """更新违约申请审核状态"""
+    def update_audit_status(app_id, auditor_id, audit_status, audit_remarks, expected_version=None):
+        """
+        更新违约申请审核状态、版本号加 1 并清除领取
+        申请被其他审核人领取且租约未过期，或版本号已不是 expected_version 时不更新
+        :param expected_version: 读取申请时的版本号，None 表示不校验
+        :return: (success, msg)
+        :raises ConflictError: 申请已被其他审核人领取或修改
+        """
         db = Database()
         try:
-            sql = """
+            sql = f"""
             UPDATE t_default_application 
-            SET auditor_id = %s, audit_status = %s, audit_remarks = %s, audit_time = %s
-            WHERE app_id = %s
+            SET auditor_id = %s, audit_status = %s, audit_remarks = %s, audit_time = %s,
+                claimed_by = NULL, claim_expires_at = NULL, version = version + 1
+            WHERE app_id = %s AND {_CLAIMABLE}
             """
             now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            success, msg = db.execute(sql, (auditor_id, audit_status, audit_remarks, now, app_id))
+            params = [auditor_id, audit_status, audit_remarks, now, app_id, auditor_id]
+            if expected_version is not None:
+                sql += " AND version = %s"
+                params.append(expected_version)
+            success, msg = db.execute(sql, params)
+            if not success:
+                db.rollback()
+                return False, msg
+            if not db.get_rowcount():
+                raise ConflictError(f"申请 {app_id} 已被其他审核人领取或修改")
+            db.commit()
+            return True, None
+        finally:
+            db.close()
+
+    @staticmethod
+    def update_audit_status_many(versions, auditor_id, audit_status, audit_remarks):
+        """
+        批量更新违约申请审核状态、版本号加 1 并清除领取（按 (app_id, version) 分批条件更新）
+        任一申请版本号已变化、已审核，或被其他审核人领取且租约未过期时整体不更新
+        :param versions: {app_id: 读取申请时的版本号}
+        :return: (success, msg)
+        :raises ConflictError: 部分申请已被其他审核人修改、审核或领取（ids 为这些申请ID）
+        """
+        db = Database()
+        try:
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            try:
+                success, msg = db.update_versioned_in(
+                    "t_default_application", "app_id", versions,
+                    "auditor_id = %s, audit_status = %s, audit_remarks = %s, audit_time = %s, "
+                    "claimed_by = NULL, claim_expires_at = NULL",
+                    [auditor_id, audit_status, audit_remarks, now],
+                    condition=f"audit_status = '待审核' AND {_CLAIMABLE}", condition_params=[auditor_id]
+                )
+            except ConflictError:
+                db.rollback()
+                raise
+            if not success:
+                db.rollback()
+                return False, msg
+            db.commit()
+            return True, None
+        finally:
+            db.close()
+
+    @staticmethod
+    def claim_pending(auditor_id, limit, lease_seconds):
+        """
+        领取待审核申请（审核队列）：按申请时间先后取最多 limit 条可领取的申请并设置租约
+        SELECT ... FOR UPDATE SKIP LOCKED 跳过其他审核人正在领取的行，多人同时领取互不等待、互不重复
+        本人已领取且未审核的申请会一并返回并续期
+        :return: 领取到的申请ID列表；失败时返回 None
+        """
+        db = Database()
+        try:
+            success, msg = db.execute(*_claim_query(auditor_id, limit))
+            if not success:
+                db.rollback()
+                return None
+            app_ids = [row['app_id'] for row in db.fetchall()]
+            if app_ids:
+                success, msg = db.execute(*_claim_update(auditor_id, lease_seconds, app_ids))
+                if not success:
+                    db.rollback()
+                    return None
+            db.commit()
+            return app_ids
+        finally:
+            db.close()
+
+    @staticmethod
+    def release_claims(auditor_id, app_ids=None):
+        """
+        释放审核人领取的申请
+        :param app_ids: 要释放的申请ID列表，None 表示该审核人领取的全部申请
+        :return: 释放的数量；失败时返回 None
+        """
+        db = Database()
+        try:
+            sql = """
+            UPDATE t_default_application
+            SET claimed_by = NULL, claim_expires_at = NULL
+            WHERE claimed_by = %s
+            """
+            params = [auditor_id]
+            if app_ids is not None:
+                app_ids = list(dict.fromkeys(app_ids))
+                if not app_ids:
+                    return 0
+                sql += f" AND app_id IN ({', '.join(['%s'] * len(app_ids))})"
+                params.extend(app_ids)
+            success, msg = db.execute(sql, params)
+            if not success:
+                db.rollback()
+                return None
+            count = db.get_rowcount()
+            db.commit()
+            return count
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_reviews(app_ids):
+        """按申请ID获取审核列表行（字段同 list_reviews），按申请时间先后排列"""
+        app_ids = list(dict.fromkeys(app_ids))
+        if not app_ids:
+            return []
+        db = Database()
+        try:
+            success, msg = db.execute(*_get_reviews_query(app_ids))
             if success:
-                db.commit()
-                return True
-            db.rollback()
-            return False
+                return [format_row(row) for row in db.fetchall()]
+            return []
         finally:
             db.close()
 
@@ -103,7 +364,7 @@ class DefaultApplicationDAO:
             success, msg = db.execute(sql)
             if success:
                 rows = db.fetchall()
-                return [dict_to_model(row, DefaultApplication) for row in rows]
+                return list(map(row_mapper(DefaultApplication), rows))
             return []
         finally:
             db.close()
@@ -117,54 +378,95 @@ class DefaultApplicationDAO:
             success, msg = db.execute(sql, (status,))
             if success:
                 rows = db.fetchall()
-                return [dict_to_model(row, DefaultApplication) for row in rows]
+                return list(map(row_mapper(DefaultApplication), rows))
             return []
         finally:
             db.close()
 
     @staticmethod
-    def list_with_filters(customer_name=None, status=None, start_date=None, end_date=None, reviewer=None):
-        """多条件筛选违约申请"""
+    def list_with_filters(customer_name=None, status=None, start_date=None, end_date=None, reviewer=None,
+                          limit=None, cursor=None, customer_id=None, as_rows=False):
+        """
+        多条件筛选违约申请（只连接筛选条件用到的表）
+        :param customer_id: 客户ID，或客户ID列表（走 customer_id 索引）
+        :param limit: 每页条数，None 表示不分页
+        :param cursor: 上一页最后一条的 (apply_time, app_id)，按键集分页
+        :param as_rows: 为 True 时直接返回行字典（时间字段已格式化），不构造实体对象
+        """
+        query = _list_with_filters_query(
+            customer_name, status, start_date, end_date, reviewer, limit, cursor, customer_id
+        )
+        if query is None:
+            return []
+        
         db = Database()
         try:
-            # 构建基础查询
-            sql = """
-            SELECT da.* FROM t_default_application da
-            LEFT JOIN t_customer_info ci ON da.customer_id = ci.customer_id
-            LEFT JOIN t_user_info ui ON da.auditor_id = ui.user_id
-            WHERE 1=1
-            """
-            params = []
-            
-            # 客户名称筛选
-            if customer_name:
-                sql += " AND ci.customer_name LIKE %s"
-                params.append(f"%{customer_name}%")
-            
-            # 审核状态筛选
-            if status:
-                sql += " AND da.audit_status = %s"
-                params.append(status)
-            
-            # 申请时间范围筛选
-            if start_date:
-                sql += " AND da.apply_time >= %s"
-                params.append(f"{start_date} 00:00:00")
-            if end_date:
-                sql += " AND da.apply_time <= %s"
-                params.append(f"{end_date} 23:59:59")
-            
-            # 审核人筛选
-            if reviewer:
-                sql += " AND ui.real_name LIKE %s"
-                params.append(f"%{reviewer}%")
-            
-            sql += " ORDER BY da.apply_time DESC"
-            
-            success, msg = db.execute(sql, params)
+            success, msg = db.execute(*query)
             if success:
                 rows = db.fetchall()
-                return [dict_to_model(row, DefaultApplication) for row in rows]
+                if as_rows:
+                    return [format_row(row) for row in rows]
+                return list(map(row_mapper(DefaultApplication), rows))
             return []
         finally:
             db.close()
+
+    @staticmethod
+    def iter_with_filters(customer_name=None, status=None, start_date=None, end_date=None, reviewer=None,
+                          limit=None, cursor=None, customer_id=None, batch_size=FETCH_BATCH_SIZE):
+        """
+        与 list_with_filters 条件相同，用服务端游标逐批读取，逐行产出行字典（时间字段已格式化）
+        :raises RuntimeError: 查询失败
+        """
+        query = _list_with_filters_query(
+            customer_name, status, start_date, end_date, reviewer, limit, cursor, customer_id
+        )
+        if query is None:
+            return
+        yield from iter_query(*query, batch_size=batch_size, mapper=format_row)
+
+    @staticmethod
+    def list_reviews(customer_name=None, status=None, start_date=None, end_date=None, reviewer=None,
+                     limit=None, cursor=None):
+        """
+        多条件筛选违约申请（审核列表），一次查询同时带出客户名称、违约原因内容和审核人姓名
+        :param limit: 每页条数，None 表示不分页
+        :param cursor: 上一页最后一条的 (apply_time, app_id)，按键集分页
+        :return: 字典列表，在申请字段基础上增加 customer_name、reason_content、auditor_name
+        """
+        db = Database()
+        try:
+            success, msg = db.execute(*_reviews_query(
+                customer_name, status, start_date, end_date, reviewer, limit, cursor
+            ))
+            if success:
+                return [format_row(row) for row in db.fetchall()]
+            return []
+        finally:
+            db.close()
+
+    @staticmethod
+    def iter_reviews(customer_name=None, status=None, start_date=None, end_date=None, reviewer=None,
+                     limit=None, cursor=None, batch_size=FETCH_BATCH_SIZE):
+        """
+        与 list_reviews 条件、字段相同，用服务端游标逐批读取，逐行产出
+        :raises RuntimeError: 查询失败
+        """
+        yield from iter_query(*_reviews_query(
+            customer_name, status, start_date, end_date, reviewer, limit, cursor
+        ), batch_size=batch_size, mapper=format_row)
+
+    @staticmethod
+    def iter_enriched(customer_name=None, status=None, start_date=None, end_date=None, reviewer=None,
+                      limit=None, cursor=None, customer_id=None, batch_size=FETCH_BATCH_SIZE):
+        """
+        多条件筛选违约申请（条件与 list_with_filters 相同），用服务端游标逐批读取，逐行产出
+        在申请字段基础上增加 customer_name、reason_content、applicant_name、auditor_name
+        :raises RuntimeError: 查询失败
+        """
+        query = _enriched_query(
+            customer_name, status, start_date, end_date, reviewer, limit, cursor, customer_id
+        )
+        if query is None:
+            return
+        yield from iter_query(*query, batch_size=batch_size, mapper=format_row)
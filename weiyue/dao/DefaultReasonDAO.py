@@ -1,38 +1,53 @@
 from db.base import Database
+from db.cache import ReferenceCache
 from db.models import (
     DefaultReason, RecoveryReason, CustomerInfo,
     DefaultApplication, RecoveryApplication, UserInfo,
     dict_to_model
 )
 from datetime import datetime
+from config import CACHE_CONFIG
+
+
+def _load_all():
+    """整表加载违约原因（供缓存使用），失败时返回 None"""
+    db = Database()
+    try:
+        sql = "SELECT * FROM t_default_reason ORDER BY create_time DESC"
+        success, msg = db.execute(sql)
+        if success:
+            return [dict_to_model(row, DefaultReason) for row in db.fetchall()]
+        return None
+    finally:
+        db.close()
+
 
 class DefaultReasonDAO:
-    """违约原因数据访问对象"""
+    """违约原因数据访问对象（读取走进程内整表缓存）"""
+    
+    _cache = ReferenceCache(_load_all, "reason_id", ttl=CACHE_CONFIG['reason_ttl'])
     
     @staticmethod
     def get_all_enabled():
         """获取所有启用的违约原因"""
-        db = Database()
-        try:
-            sql = "SELECT * FROM t_default_reason ORDER BY create_time DESC"
-            success, msg = db.execute(sql)
-            if success:
-                results = db.fetchall()
-                return [dict_to_model(row, DefaultReason) for row in results]
-            return []
-        finally:
-            db.close()
+        return DefaultReasonDAO._cache.all()
     
     @staticmethod
     def get_by_id(reason_id):
         """根据ID获取违约原因"""
-        db = Database()
-        try:
-            sql = "SELECT * FROM t_default_reason WHERE reason_id = %s"
-            success, msg = db.execute(sql, (reason_id,))
-            if success:
-                row = db.fetchone()
-                return dict_to_model(row, DefaultReason)
-            return None
-        finally:
-            db.close()
+        return DefaultReasonDAO._cache.get(reason_id)
+    
+    @staticmethod
+    def get_many(reason_ids):
+        """根据ID集合批量获取违约原因，返回以ID为键的字典"""
+        return DefaultReasonDAO._cache.get_many(reason_ids)
+    
+    @staticmethod
+    def invalidate_cache():
+        """违约原因被修改后调用，使缓存失效"""
+        DefaultReasonDAO._cache.invalidate()
+    
+    @staticmethod
+    def cache_stats():
+        """缓存命中统计"""
+        return DefaultReasonDAO._cache.stats()
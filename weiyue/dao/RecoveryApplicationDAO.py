@@ -1,11 +1,63 @@
-from db.base import Database
+from db.base import ConflictError, Database, FETCH_BATCH_SIZE, iter_query
+from db.filters import filter_clause, filter_joins, build_query
 from db.models import (
     DefaultReason, RecoveryReason, CustomerInfo,
     DefaultApplication, RecoveryApplication, UserInfo,
-    dict_to_model
+    dict_to_model, row_mapper, format_row
 )
 from datetime import datetime
 
+
+# 重生申请列表排序：申请时间倒序，同一时间按申请ID倒序（与键集分页游标一致）
+_ORDER_BY = "ra.apply_time DESC, ra.recovery_app_id DESC"
+
+
+def _filter_clause(customer_name=None, status=None, start_date=None, end_date=None, reviewer=None,
+                   cursor=None, customer_id=None):
+    """重生申请筛选条件（列表、导出共用），见 db.filters.filter_clause"""
+    return filter_clause('ra', 'recovery_app_id', customer_name, status, start_date, end_date, reviewer,
+                         cursor, customer_id)
+
+
+def _list_with_filters_query(customer_name, status, start_date, end_date, reviewer, limit, cursor,
+                             customer_id):
+    """
+    构建 list_with_filters 的查询：只在按客户名称、审核人筛选时才连接客户表、用户表
+    :return: (SQL, 参数列表)；按空的客户ID列表筛选时返回 None
+    """
+    select = "SELECT ra.* FROM t_recovery_application ra" + filter_joins('ra', customer_name, reviewer)
+    filters = _filter_clause(customer_name, status, start_date, end_date, reviewer, cursor, customer_id)
+    return build_query(select, filters, _ORDER_BY, limit)
+
+
+# 导出查询：关联客户、原违约申请、违约原因、重生原因和审核人
+_ENRICHED_SELECT = """
+SELECT ra.*,
+       ci.customer_name, ci.current_external_rating,
+       da.app_id AS original_app_id,
+       da.severity_level AS original_severity_level,
+       da.default_reason_id AS original_reason_id,
+       dr.reason_content AS original_reason_content,
+       rr.recovery_content,
+       ui.real_name AS auditor_name
+FROM t_recovery_application ra
+LEFT JOIN t_customer_info ci ON ra.customer_id = ci.customer_id
+LEFT JOIN t_default_application da ON ra.original_default_app_id = da.app_id
+LEFT JOIN t_default_reason dr ON da.default_reason_id = dr.reason_id
+LEFT JOIN t_recovery_reason rr ON ra.recovery_reason_id = rr.recovery_id
+LEFT JOIN t_user_info ui ON ra.auditor_id = ui.user_id
+"""
+
+
+def _enriched_query(customer_name, status, start_date, end_date, reviewer, limit, cursor, customer_id):
+    """
+    构建关联客户、原违约申请、原因和审核人的重生申请查询
+    :return: (SQL, 参数列表)；按空的客户ID列表筛选时返回 None
+    """
+    filters = _filter_clause(customer_name, status, start_date, end_date, reviewer, cursor, customer_id)
+    return build_query(_ENRICHED_SELECT, filters, _ORDER_BY, limit)
+
+
 class RecoveryApplicationDAO:
     """重生申请数据访问对象"""
     
@@ -54,22 +106,77 @@ class RecoveryApplicationDAO:
             db.close()
     
     @staticmethod
-    def update_audit_status(app_id, auditor_id, audit_status, audit_remarks):
-        """更新重生申请审核状态"""
+    def get_many(app_ids):
+        """根据ID集合批量获取重生申请，返回以ID为键的字典"""
+        db = Database()
+        try:
+            success, rows = db.select_in("t_recovery_application", "recovery_app_id", app_ids)
+            if success:
+                map_row = row_mapper(RecoveryApplication)
+                return {row['recovery_app_id']: map_row(row) for row in rows}
+            return {}
+        finally:
+            db.close()
+    
+    @staticmethod
+    def update_audit_status(app_id, auditor_id, audit_status, audit_remarks, expected_version=None):
+        """
+        更新重生申请审核状态并将版本号加 1；版本号已不是 expected_version 时不更新
+        :param expected_version: 读取申请时的版本号，None 表示不校验
+        :return: (success, msg)
+        :raises ConflictError: 重生申请已被其他审核人修改
+        """
         db = Database()
         try:
             sql = """
             UPDATE t_recovery_application 
-            SET auditor_id = %s, audit_status = %s, audit_remarks = %s, audit_time = %s
+            SET auditor_id = %s, audit_status = %s, audit_remarks = %s, audit_time = %s,
+                version = version + 1
             WHERE recovery_app_id = %s
             """
             now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            success, msg = db.execute(sql, (auditor_id, audit_status, audit_remarks, now, app_id))
-            if success:
-                db.commit()
-                return True
-            db.rollback()
-            return False
+            params = [auditor_id, audit_status, audit_remarks, now, app_id]
+            if expected_version is not None:
+                sql += " AND version = %s"
+                params.append(expected_version)
+            success, msg = db.execute(sql, params)
+            if not success:
+                db.rollback()
+                return False, msg
+            if not db.get_rowcount():
+                raise ConflictError(f"重生申请 {app_id} 已被其他审核人修改")
+            db.commit()
+            return True, None
+        finally:
+            db.close()
+
+    @staticmethod
+    def update_audit_status_many(versions, auditor_id, audit_status, audit_remarks):
+        """
+        批量更新重生申请审核状态并将版本号加 1（按 (recovery_app_id, version) 分批条件更新）
+        任一申请版本号已变化或已审核时整体不更新
+        :param versions: {recovery_app_id: 读取申请时的版本号}
+        :return: (success, msg)
+        :raises ConflictError: 部分申请已被其他审核人修改或审核（ids 为这些申请ID）
+        """
+        db = Database()
+        try:
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            try:
+                success, msg = db.update_versioned_in(
+                    "t_recovery_application", "recovery_app_id", versions,
+                    "auditor_id = %s, audit_status = %s, audit_remarks = %s, audit_time = %s",
+                    [auditor_id, audit_status, audit_remarks, now],
+                    condition="audit_status = '待审核'"
+                )
+            except ConflictError:
+                db.rollback()
+                raise
+            if not success:
+                db.rollback()
+                return False, msg
+            db.commit()
+            return True, None
         finally:
             db.close()
 
@@ -82,7 +189,7 @@ class RecoveryApplicationDAO:
             success, msg = db.execute(sql)
             if success:
                 rows = db.fetchall()
-                return [dict_to_model(row, RecoveryApplication) for row in rows]
+                return list(map(row_mapper(RecoveryApplication), rows))
             return []
         finally:
             db.close()
@@ -96,7 +203,72 @@ class RecoveryApplicationDAO:
             success, msg = db.execute(sql, (status,))
             if success:
                 rows = db.fetchall()
-                return [dict_to_model(row, RecoveryApplication) for row in rows]
+                return list(map(row_mapper(RecoveryApplication), rows))
             return []
         finally:
             db.close()
+
+    @staticmethod
+    def list_with_filters(customer_name=None, status=None, start_date=None, end_date=None, reviewer=None,
+                          limit=None, cursor=None, customer_id=None):
+        """
+        多条件筛选重生申请（与违约申请的 list_with_filters 对应）
+        :param customer_id: 客户ID，或客户ID列表
+        :param limit: 每页条数，None 表示不分页
+        :param cursor: 上一页最后一条的 (apply_time, recovery_app_id)，按键集分页
+        """
+        query = _list_with_filters_query(
+            customer_name, status, start_date, end_date, reviewer, limit, cursor, customer_id
+        )
+        if query is None:
+            return []
+        
+        db = Database()
+        try:
+            success, msg = db.execute(*query)
+            if success:
+                rows = db.fetchall()
+                return list(map(row_mapper(RecoveryApplication), rows))
+            return []
+        finally:
+            db.close()
+
+    @staticmethod
+    def list_enriched(customer_name=None, status=None, start_date=None, end_date=None, reviewer=None,
+                      limit=None, cursor=None, customer_id=None):
+        """
+        多条件筛选重生申请，一次查询同时带出客户、原违约申请、违约原因、重生原因和审核人信息
+        :param limit: 每页条数，None 表示不分页
+        :param cursor: 上一页最后一条的 (apply_time, recovery_app_id)，按键集分页
+        :return: 字典列表，在重生申请字段基础上增加 customer_name、current_external_rating、
+                 original_app_id、original_severity_level、original_reason_id、original_reason_content、
+                 recovery_content、auditor_name
+        """
+        query = _enriched_query(
+            customer_name, status, start_date, end_date, reviewer, limit, cursor, customer_id
+        )
+        if query is None:
+            return []
+        
+        db = Database()
+        try:
+            success, msg = db.execute(*query)
+            if success:
+                return [format_row(row) for row in db.fetchall()]
+            return []
+        finally:
+            db.close()
+
+    @staticmethod
+    def iter_enriched(customer_name=None, status=None, start_date=None, end_date=None, reviewer=None,
+                      limit=None, cursor=None, customer_id=None, batch_size=FETCH_BATCH_SIZE):
+        """
+        与 list_enriched 条件、字段相同，用服务端游标逐批读取，逐行产出
+        :raises RuntimeError: 查询失败
+        """
+        query = _enriched_query(
+            customer_name, status, start_date, end_date, reviewer, limit, cursor, customer_id
+        )
+        if query is None:
+            return
+        yield from iter_query(*query, batch_size=batch_size, mapper=format_row)
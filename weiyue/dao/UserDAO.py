@@ -5,24 +5,77 @@ from db.models import (
     dict_to_model
 )
 from datetime import datetime
+from db.cache import LRUCache
+from config import CACHE_CONFIG
+
+
+def _without_password(user):
+    """复制一份不含密码的用户对象，缓存中绝不保存密码哈希"""
+    data = user.to_dict()
+    data['password'] = None
+    return UserInfo(**data)
 
 class UserDAO:
     """用户信息数据访问对象"""
     
+    _cache = LRUCache(max_size=CACHE_CONFIG['user_max_size'], ttl=CACHE_CONFIG['user_ttl'])
+    
     @staticmethod
     def get_by_id(user_id):
-        """根据ID获取用户信息"""
+        """根据ID获取用户信息（走LRU缓存，返回的对象不含密码）"""
+        user = UserDAO._cache.get(user_id)
+        if user is not None:
+            return user
         db = Database()
         try:
             sql = "SELECT * FROM t_user_info WHERE user_id = %s"
             success, msg = db.execute(sql, (user_id,))
             if success:
                 row = db.fetchone()
-                return dict_to_model(row, UserInfo)
+                user = dict_to_model(row, UserInfo)
+                if user:
+                    user = _without_password(user)
+                    UserDAO._cache.put(user_id, user)
+                return user
             return None
         finally:
             db.close()
     
+    @staticmethod
+    def get_many(user_ids):
+        """根据ID集合批量获取用户信息，返回以ID为键的字典（未命中缓存的部分一次批量查询）"""
+        result = {}
+        missing = []
+        for user_id in dict.fromkeys(k for k in user_ids if k is not None):
+            user = UserDAO._cache.get(user_id)
+            if user is not None:
+                result[user_id] = user
+            else:
+                missing.append(user_id)
+        if not missing:
+            return result
+        db = Database()
+        try:
+            success, rows = db.select_in("t_user_info", "user_id", missing)
+            if success:
+                for row in rows:
+                    user = _without_password(dict_to_model(row, UserInfo))
+                    UserDAO._cache.put(user.user_id, user)
+                    result[user.user_id] = user
+            return result
+        finally:
+            db.close()
+    
+    @staticmethod
+    def invalidate_cache(user_id=None):
+        """用户新增或修改后调用，使对应缓存失效；user_id 为 None 时清空"""
+        UserDAO._cache.invalidate(user_id)
+    
+    @staticmethod
+    def cache_stats():
+        """缓存命中统计"""
+        return UserDAO._cache.stats()
+    
     @staticmethod
     def verify_user(username, password):
         """验证用户登录信息"""
@@ -74,6 +127,7 @@ class UserDAO:
             success, msg = db.execute(sql, values)
             if success:
                 db.commit()
+                db.after_commit(lambda: UserDAO.invalidate_cache(user_info.user_id))
             else:
                 db.rollback()
             return success
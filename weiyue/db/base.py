@@ -1,52 +1,165 @@
-import pymysql
-from pymysql.cursors import DictCursor
-from config import DB_CONFIG
+import threading
+from contextlib import contextmanager
+
+from pymysql.cursors import SSDictCursor
+
+from db.pool import get_pool
+from config import STREAM_CONFIG
+
+# IN (...) 批量查询时每批最多携带的主键数量
+IN_CHUNK_SIZE = 500
+
+# 服务端游标每批读取的行数
+FETCH_BATCH_SIZE = STREAM_CONFIG['fetch_size']
+
+# 当前线程正在进行的工作单元
+_local = threading.local()
+
+
+class ConflictError(Exception):
+    """条件更新未命中：数据在读取后已被其他人修改或领取（乐观锁冲突），调用方应刷新后重试"""
+    
+    def __init__(self, message, ids=None):
+        super().__init__(message)
+        self.ids = list(ids or [])   # 批量更新时发生冲突的主键
+
+
+class UnitOfWork:
+    """工作单元：一组 DAO 操作共用同一个连接，最后统一提交或回滚"""
+    
+    def __init__(self, connection):
+        self.connection = connection
+        self.rollback_only = False
+        self._after_commit = []
+        
+    def set_rollback_only(self):
+        """标记为只能回滚（任一步骤失败时调用）"""
+        self.rollback_only = True
+        
+    def after_commit(self, callback):
+        """登记提交成功后执行的回调（如缓存写穿透）"""
+        self._after_commit.append(callback)
+
+
+def current_unit_of_work():
+    """获取当前线程正在进行的工作单元，没有时返回 None"""
+    return getattr(_local, 'uow', None)
+
+
+@contextmanager
+def unit_of_work():
+    """
+    开启工作单元：块内创建的 Database 对象共用同一个连接，commit 延迟到块结束时统一执行，
+    任一步骤 rollback 或抛出异常则整体回滚；嵌套使用时加入外层工作单元
+    """
+    outer = current_unit_of_work()
+    if outer is not None:
+        yield outer
+        return
+    
+    connection = get_pool().acquire()
+    uow = UnitOfWork(connection)
+    _local.uow = uow
+    broken = False
+    try:
+        yield uow
+    except Exception:
+        uow.set_rollback_only()
+        raise
+    finally:
+        _local.uow = None
+        try:
+            if uow.rollback_only:
+                connection.rollback()
+            else:
+                connection.commit()
+        except Exception:
+            broken = True
+            uow.set_rollback_only()
+            raise
+        finally:
+            get_pool().release(connection, discard=broken)
+    
+    if not uow.rollback_only:
+        for callback in uow._after_commit:
+            callback()
+
 
 class Database:
-    """数据库连接基础类，提供连接管理和事务处理"""
+    """数据库连接基础类，提供连接管理和事务处理（连接从进程内连接池借出）"""
     
-    def __init__(self):
+    def __init__(self, join_transaction=True, server_side=False):
+        """
+        :param join_transaction: 处于工作单元中时是否加入其连接；
+                                 需要独立提交的操作（如序号预留）传 False
+        :param server_side: 使用服务端游标（SSDictCursor），结果集逐批从服务器读取而不是一次载入内存；
+                            读完之前连接不能执行其他语句，因此不加入工作单元
+        """
         self.connection = None
         self.cursor = None
+        self._join_transaction = join_transaction and not server_side
+        self._server_side = server_side
+        self._drained = True
+        self._uow = None
         
     def connect(self):
-        """建立数据库连接"""
+        """从连接池借出数据库连接（处于工作单元中时复用其连接）"""
+        uow = current_unit_of_work() if self._join_transaction else None
         try:
-            self.connection = pymysql.connect(
-                host=DB_CONFIG['host'],
-                user=DB_CONFIG['user'],
-                password=DB_CONFIG['password'],
-                database=DB_CONFIG['database'],
-                port=DB_CONFIG['port'],
-                charset=DB_CONFIG['charset'],
-                cursorclass=DictCursor,
-                use_unicode=True,
-                init_command="SET NAMES utf8mb4"
-            )
-            self.cursor = self.connection.cursor()
+            if uow is not None:
+                self._uow = uow
+                self.connection = uow.connection
+            else:
+                self.connection = get_pool().acquire()
+            self.cursor = self.connection.cursor(SSDictCursor) if self._server_side else self.connection.cursor()
             return True
         except Exception as e:
+            if self.connection and self._uow is None:
+                get_pool().release(self.connection, discard=True)
+            self.connection = None
+            self._uow = None
             print(f"数据库连接失败: {str(e)}")
             return False
             
     def close(self):
-        """关闭数据库连接"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
+        """关闭游标并将连接归还连接池（工作单元的连接由工作单元负责归还）"""
+        broken = False
+        if self.cursor and not self._drained:
+            # 服务端游标未读完：关闭游标需要读完剩余结果，直接丢弃连接代价更小
+            broken = True
+        elif self.cursor:
+            try:
+                self.cursor.close()
+            except Exception:
+                broken = True
+        if self.connection and self._uow is None:
+            get_pool().release(self.connection, discard=broken)
         self.cursor = None
         self.connection = None
+        self._uow = None
+        self._drained = True
         
     def commit(self):
-        """提交事务"""
+        """提交事务（处于工作单元中时延迟到工作单元结束）"""
+        if self._uow is not None:
+            return
         if self.connection:
             self.connection.commit()
             
     def rollback(self):
-        """回滚事务"""
+        """回滚事务（处于工作单元中时标记整个工作单元回滚）"""
+        if self._uow is not None:
+            self._uow.set_rollback_only()
+            return
         if self.connection:
             self.connection.rollback()
+            
+    def after_commit(self, callback):
+        """提交成功后执行回调；处于工作单元中时延迟到工作单元提交之后"""
+        if self._uow is not None:
+            self._uow.after_commit(callback)
+        else:
+            callback()
     
     def update(self, table_name, update_data, condition_data):
         try:
@@ -75,6 +188,72 @@ class Database:
             self.rollback()  # 出错回滚事务
             return False, f"修改失败：{str(e)}"
     
+    def select_in(self, table_name, key_column, keys, chunk_size=IN_CHUNK_SIZE):
+        """
+        按主键集合批量查询，去重后分批执行 IN (...) 查询
+        :param table_name: 表名
+        :param key_column: 主键列名
+        :param keys: 主键集合（可含重复值和None）
+        :return: (success, rows 或错误信息)
+        """
+        unique_keys = list(dict.fromkeys(k for k in keys if k is not None))
+        rows = []
+        for i in range(0, len(unique_keys), chunk_size):
+            chunk = unique_keys[i:i + chunk_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            sql = f"SELECT * FROM {table_name} WHERE {key_column} IN ({placeholders})"
+            success, msg = self.execute(sql, chunk)
+            if not success:
+                return False, msg
+            rows.extend(self.fetchall())
+        return True, rows
+    
+    def update_versioned_in(self, table_name, key_column, versions, set_sql, set_params,
+                            condition="1=1", condition_params=(), chunk_size=IN_CHUNK_SIZE):
+        """
+        按 (主键, 版本号) 批量条件更新（乐观锁），每行 version 加 1
+        先分批 SELECT ... FOR UPDATE 锁定全部行，找出版本号已变化、不满足 condition 或已不存在的行；
+        有冲突时不执行更新，否则分批 UPDATE ... WHERE (主键, version) IN (...) AND condition 并核对影响行数
+        :param versions: {主键: 读取时的版本号}
+        :param set_sql: SET 子句（不含 version）
+        :param condition: 更新时还需满足的条件（如审核状态），condition_params 为其参数
+        :return: (success, msg)；冲突时不回滚，由调用方回滚
+        :raises ConflictError: 部分行已被修改或不满足条件，ids 为这些行的主键
+        """
+        keys = list(versions)
+        conflicts = []
+        for i in range(0, len(keys), chunk_size):
+            chunk = keys[i:i + chunk_size]
+            sql = f"""
+            SELECT {key_column} AS id, version, ({condition}) AS matched FROM {table_name}
+            WHERE {key_column} IN ({', '.join(['%s'] * len(chunk))}) FOR UPDATE
+            """
+            success, msg = self.execute(sql, list(condition_params) + chunk)
+            if not success:
+                return False, msg
+            current = {row['id']: row for row in self.fetchall()}
+            conflicts.extend(
+                key for key in chunk
+                if key not in current or current[key]['version'] != versions[key] or not current[key]['matched']
+            )
+        if conflicts:
+            raise ConflictError(f"以下记录已被其他人修改、审核或领取，整体未更新: {', '.join(map(str, conflicts))}", conflicts)
+        
+        for i in range(0, len(keys), chunk_size):
+            chunk = keys[i:i + chunk_size]
+            sql = f"""
+            UPDATE {table_name} SET {set_sql}, version = version + 1
+            WHERE ({key_column}, version) IN ({', '.join(['(%s, %s)'] * len(chunk))}) AND {condition}
+            """
+            params = list(set_params) + [v for key in chunk for v in (key, versions[key])] + list(condition_params)
+            success, msg = self.execute(sql, params)
+            if not success:
+                return False, msg
+            if self.get_rowcount() < len(chunk):
+                # 行已加锁，正常情况下不会发生
+                raise ConflictError("部分记录已被其他人修改，整体未更新", chunk)
+        return True, None
+    
     def execute(self, sql, params=None):
         """执行SQL语句"""
         try:
@@ -86,6 +265,18 @@ class Database:
                 self.cursor.execute(sql, params)
             else:
                 self.cursor.execute(sql)
+            self._drained = not self._server_side
+            return True, None
+        except Exception as e:
+            return False, f"SQL执行错误: {str(e)}"
+            
+    def executemany(self, sql, seq_of_params):
+        """批量执行同一条SQL（INSERT ... VALUES 语句由驱动合并为多行插入）"""
+        try:
+            if not self.connection:
+                if not self.connect():
+                    return False, "数据库连接失败"
+            self.cursor.executemany(sql, seq_of_params)
             return True, None
         except Exception as e:
             return False, f"SQL执行错误: {str(e)}"
@@ -94,6 +285,23 @@ class Database:
         """获取所有查询结果"""
         return self.cursor.fetchall() if self.cursor else []
         
+    def fetchmany(self, size=FETCH_BATCH_SIZE):
+        """获取下一批查询结果（服务端游标读完时标记结果集已读完）"""
+        if not self.cursor:
+            return []
+        rows = self.cursor.fetchmany(size)
+        if not rows:
+            self._drained = True
+        return rows
+        
+    def iter_rows(self, batch_size=FETCH_BATCH_SIZE):
+        """按批读取并逐行产出查询结果"""
+        while True:
+            rows = self.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+        
     def fetchone(self):
         """获取单条查询结果"""
         return self.cursor.fetchone() if self.cursor else None
@@ -101,3 +309,25 @@ class Database:
     def get_lastrowid(self):
         """获取最后插入的ID"""
         return self.cursor.lastrowid if self.cursor else None
+        
+    def get_rowcount(self):
+        """获取最近一条语句影响的行数"""
+        return self.cursor.rowcount if self.cursor else 0
+
+
+def iter_query(sql, params=None, batch_size=FETCH_BATCH_SIZE, mapper=None):
+    """
+    用服务端游标执行查询并逐行产出结果，内存占用与结果集大小无关
+    迭代结束或生成器被关闭（如客户端断开）时归还连接
+    :param mapper: 逐行处理函数（如 format_row），None 表示原样产出
+    :raises RuntimeError: 查询失败
+    """
+    db = Database(server_side=True)
+    try:
+        success, msg = db.execute(sql, params)
+        if not success:
+            raise RuntimeError(msg)
+        for row in db.iter_rows(batch_size):
+            yield mapper(row) if mapper else row
+    finally:
+        db.close()
@@ -0,0 +1,114 @@
+"""
+行到实体对象映射的基准测试
+
+构造 10 万行与数据库查询结果结构相同的字典，对比旧的反射式映射（无 __slots__ 的实体、
+按构造函数参数过滤、strftime 格式化时间）与当前 dict_to_model 的耗时和内存占用（不需要数据库连接）。
+用法（在 weiyue 目录下）：
+    python -m db.bench_models [行数]
+"""
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from db.models import DefaultApplication, CustomerInfo, dict_to_model
+
+DEFAULT_ROWS = 100_000
+ROUNDS = 5
+
+
+def make_default_application_rows(count):
+    """构造违约申请查询结果"""
+    base = datetime(2024, 1, 1, 9, 0, 0)
+    return [
+        {
+            'app_id': f"DA{i:08d}",
+            'customer_id': f"C{i % 5000:06d}",
+            'default_reason_id': f"R{i % 12:03d}",
+            'severity_level': '高',
+            'remarks': '逾期超过90天',
+            'attachment_url': None,
+            'applicant_id': 'U000001',
+            'apply_time': base + timedelta(minutes=i),
+            'audit_status': '同意',
+            'auditor_id': 'U000002',
+            'audit_time': base + timedelta(minutes=i, hours=2),
+            'audit_remarks': None,
+        }
+        for i in range(count)
+    ]
+
+
+def make_customer_rows(count):
+    """构造客户信息查询结果"""
+    base = datetime(2023, 6, 1, 0, 0, 0)
+    return [
+        {
+            'customer_id': f"C{i:06d}",
+            'customer_name': f"测试客户{i}有限公司",
+            'current_external_rating': 'AA',
+            'industry_type': '制造业',
+            'region': '华东',
+            'is_default': i % 2,
+            'create_time': base + timedelta(seconds=i),
+            'update_time': None,
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_model_class(model_class):
+    """与模型类构造函数相同、但没有 __slots__ 的实体类（优化前的实体结构）"""
+    return type(f"Legacy{model_class.__name__}", (), {'__init__': model_class.__init__})
+
+
+def legacy_dict_to_model(data, model_class):
+    """优化前的 dict_to_model：原地格式化时间字段，按构造函数参数名过滤后调用 __init__"""
+    if not data:
+        return None
+    for key, value in data.items():
+        if isinstance(value, datetime):
+            data[key] = value.strftime('%Y-%m-%d %H:%M:%S')
+    params = {k: v for k, v in data.items() if k in model_class.__init__.__code__.co_varnames}
+    return model_class(**params)
+
+
+def bench(convert, model_class, make_rows, count):
+    """
+    :param convert: 映射函数 (row, model_class) -> 实体对象
+    :return: (最快一轮的耗时秒数, 结果对象占用的内存字节数, 映射过程的内存峰值字节数)
+    """
+    best = None
+    for _ in range(ROUNDS):
+        # 旧映射会原地修改行，每轮使用新构造的数据
+        rows = make_rows(count)
+        start = time.perf_counter()
+        [convert(row, model_class) for row in rows]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    rows = make_rows(count)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    models = [convert(row, model_class) for row in rows]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del models
+    return best, current - before, peak - before
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    for model_class, make_rows in ((DefaultApplication, make_default_application_rows),
+                                   (CustomerInfo, make_customer_rows)):
+        runs = (
+            ("优化前", bench(legacy_dict_to_model, legacy_model_class(model_class), make_rows, count)),
+            ("当前", bench(dict_to_model, model_class, make_rows, count)),
+        )
+        for label, (elapsed, retained, peak) in runs:
+            print(f"{model_class.__name__:<20} {label:<4} {count} 行: 耗时 {elapsed * 1000:8.1f} ms, "
+                  f"结果占用 {retained / 1024 / 1024:6.1f} MiB, 峰值 {peak / 1024 / 1024:6.1f} MiB")
+        (old_elapsed, old_retained, _), (new_elapsed, new_retained, _) = (result for _, result in runs)
+        print(f"{model_class.__name__:<20} 提速 {old_elapsed / new_elapsed:.2f}x, "
+              f"结果占用减少 {(1 - new_retained / old_retained) * 100:.0f}%")
@@ -0,0 +1,225 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ReferenceCache:
+    """
+    整表引用数据缓存：首次使用时整表加载，之后直接从内存读取
+    适用于行数少、很少修改的字典表（如违约原因、重生原因），写入后调用 invalidate 使其失效
+    缓存中的对象为共享实例，调用方只读不改
+    """
+
+    def __init__(self, loader, key_attr, ttl=None):
+        """
+        :param loader: 加载整表的函数，返回模型对象列表；加载失败时返回 None
+        :param key_attr: 作为主键的属性名
+        :param ttl: 缓存有效秒数，None 表示仅在失效时重新加载（兜底其他进程的修改）
+        """
+        self._loader = loader
+        self._key_attr = key_attr
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._items = None
+        self._index = None
+        self._loaded_at = 0.0
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._invalidations = 0
+
+    def _snapshot(self):
+        """返回 (items, index)，必要时在锁内整表加载"""
+        with self._lock:
+            expired = self._ttl and time.monotonic() - self._loaded_at > self._ttl
+            if self._items is not None and not expired:
+                self._hits += 1
+                return self._items, self._index
+            self._misses += 1
+            # 加载在锁内完成：与 invalidate 串行，失效后不会装入旧数据
+            items = self._loader()
+            if items is None:
+                return [], {}
+            self._items = items
+            # 主键统一按字符串索引，URL 参数与数值型主键都能命中
+            self._index = {str(getattr(item, self._key_attr)): item for item in items}
+            self._loaded_at = time.monotonic()
+            self._loads += 1
+            return self._items, self._index
+
+    def all(self):
+        """获取全部记录（保持加载时的顺序）"""
+        items, _ = self._snapshot()
+        return list(items)
+
+    def get(self, key):
+        """按主键获取单条记录，不存在时返回 None"""
+        _, index = self._snapshot()
+        return index.get(str(key))
+
+    def get_many(self, keys):
+        """按主键集合获取记录，返回以主键为键的字典"""
+        _, index = self._snapshot()
+        return {key: index[str(key)] for key in keys if str(key) in index}
+
+    def invalidate(self):
+        """使缓存失效，下次读取时重新加载"""
+        with self._lock:
+            self._items = None
+            self._index = None
+            self._invalidations += 1
+
+    def stats(self):
+        """缓存命中统计"""
+        with self._lock:
+            return {
+                'loaded': self._items is not None,
+                'size': len(self._items) if self._items is not None else 0,
+                'hits': self._hits,
+                'misses': self._misses,
+                'loads': self._loads,
+                'invalidations': self._invalidations
+            }
+
+
+class LRUCache:
+    """
+    有界 LRU 缓存，条目带过期时间（TTL）
+    超过 max_size 时淘汰最久未使用的条目；缓存中的对象为共享实例，调用方只读不改
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        """
+        :param max_size: 最大条目数
+        :param ttl: 条目有效秒数，None 表示不过期
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()   # key -> (value, expires_at)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key):
+        """读取条目，未命中或已过期时返回 None"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() > expires_at:
+                del self._data[key]
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        """写入条目，必要时淘汰最久未使用的条目"""
+        with self._lock:
+            self._put_locked(key, value)
+
+    def _put_locked(self, key, value):
+        """写入条目（调用方需持有锁）"""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, key=None):
+        """删除指定条目；key 为 None 时清空缓存"""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+            self._invalidations += 1
+
+    def stats(self):
+        """缓存命中统计"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations
+            }
+
+
+class VersionedCache(LRUCache):
+    """
+    带写入版本号的 LRU 缓存，用于写穿透（write-through）场景
+    读取方在查询数据库前通过 read_version 取得版本号，装入时若该键在此之后已被写入则放弃，
+    避免较旧的读结果覆盖较新的写入
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        super().__init__(max_size=max_size, ttl=ttl)
+        self._seq = 0
+        self._written = OrderedDict()  # key -> 最近一次写入的版本号，数量与 max_size 同级
+        self._floor = 0                # 已从 _written 中淘汰的最大版本号
+
+    def read_version(self):
+        """读取数据库前调用，返回当前版本号"""
+        with self._lock:
+            return self._seq
+
+    def put_if_fresh(self, key, value, version):
+        """
+        装入读取结果；若读取开始后该键已被写入则放弃
+        :param version: 读取前 read_version 返回的版本号
+        :return: 是否装入
+        """
+        # 版本检查与装入在同一次加锁内完成，中间不会插入其他线程的 write / invalidate
+        with self._lock:
+            if self._written.get(key, self._floor) > version:
+                return False
+            self._put_locked(key, value)
+            return True
+
+    def write(self, key, updater):
+        """
+        写穿透：数据库写入提交后调用，更新版本号并同步缓存条目
+        :param updater: 接收当前缓存值、返回新值的函数；条目不在缓存中时不调用
+        """
+        with self._lock:
+            self._mark_written(key)
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                self._data[key] = (updater(value), expires_at)
+
+    def invalidate(self, key=None):
+        """
+        删除指定条目并更新版本号，读取开始于此之前的结果不会再被装入；key 为 None 时清空缓存
+        """
+        with self._lock:
+            if key is None:
+                self._seq += 1
+                self._data.clear()
+                self._written.clear()
+                self._floor = self._seq
+            else:
+                self._mark_written(key)
+                self._data.pop(key, None)
+            self._invalidations += 1
+
+    def _mark_written(self, key):
+        """记录键的写入版本号（调用方需持有锁）"""
+        self._seq += 1
+        self._written[key] = self._seq
+        self._written.move_to_end(key)
+        while len(self._written) > self.max_size:
+            _, pruned = self._written.popitem(last=False)
+            self._floor = max(self._floor, pruned)
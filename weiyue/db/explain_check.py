@@ -0,0 +1,179 @@
+"""
+DAO 查询执行计划检查
+
+逐个调用 DAO 的热点查询，在执行每条 SELECT 前先执行 EXPLAIN，发现业务大表出现全表扫描
+（type = ALL）时报告，用于在本地 MySQL 上做索引回归检查。
+应在执行过 db.schema 迁移、且各表有一定数据量的库上运行（空表或极小的表优化器可能直接选择全表扫描）。
+tests/test_explain_plans.py 对每个查询各生成一个测试用例（连不上 MySQL 时跳过）；也可以直接运行：
+    python -m db.explain_check
+"""
+import sys
+from contextlib import contextmanager
+
+from db.base import Database, unit_of_work
+from db.pool import get_pool
+from dao.CustomerDAO import CustomerDAO
+from dao.UserDAO import UserDAO
+from dao.DefaultApplicationDAO import DefaultApplicationDAO
+from dao.RecoveryApplicationDAO import RecoveryApplicationDAO
+
+# 允许全表扫描的表：行数很少的字典表和内部表（EXPLAIN 中有别名时显示别名，一并列出）
+SCAN_ALLOWED_TABLES = {'t_default_reason', 't_recovery_reason', 't_id_sequence', 't_schema_version', 'dr', 'rr'}
+
+# 探测用的取值：不需要真实存在，只用于生成执行计划
+PROBE_ID = '__explain_probe__'
+PROBE_CURSOR = ['2000-01-01 00:00:00', PROBE_ID]
+
+
+
+def rolled_back(call):
+    """在最终回滚的工作单元中执行会写库的查询（如领取申请），检查后不留下修改"""
+    def run():
+        with unit_of_work() as uow:
+            uow.set_rollback_only()
+            call()
+    return run
+
+
+# 需要检查的查询：(名称, 调用函数)
+QUERIES = [
+    ("CustomerDAO.get_by_id", lambda: CustomerDAO.get_by_id(PROBE_ID)),
+    ("CustomerDAO.get_many", lambda: CustomerDAO.get_many([PROBE_ID, PROBE_ID + '2'])),
+    ("CustomerDAO.list_all(page)", lambda: CustomerDAO.list_all(limit=20, cursor=PROBE_CURSOR)),
+    ("CustomerDAO.list_defaulted(page)", lambda: CustomerDAO.list_defaulted(limit=20, cursor=PROBE_CURSOR)),
+    ("CustomerDAO.warm_cache", lambda: CustomerDAO.warm_cache(limit=20)),
+    ("CustomerDAO.list_search_fields(changed_since)",
+     lambda: CustomerDAO.list_search_fields(changed_since='2000-01-01 00:00:00')),
+    ("UserDAO.get_by_id", lambda: UserDAO.get_by_id(PROBE_ID)),
+    ("UserDAO.get_by_username", lambda: UserDAO.get_by_username(PROBE_ID)),
+    ("UserDAO.verify_user", lambda: UserDAO.verify_user(PROBE_ID, PROBE_ID)),
+    ("DefaultApplicationDAO.get_by_id", lambda: DefaultApplicationDAO.get_by_id(PROBE_ID)),
+    ("DefaultApplicationDAO.get_many", lambda: DefaultApplicationDAO.get_many([PROBE_ID, PROBE_ID + '2'])),
+    ("DefaultApplicationDAO.get_latest_by_customer",
+     lambda: DefaultApplicationDAO.get_latest_by_customer(PROBE_ID)),
+    ("DefaultApplicationDAO.list_with_filters(page)",
+     lambda: DefaultApplicationDAO.list_with_filters(limit=20, cursor=PROBE_CURSOR)),
+    ("DefaultApplicationDAO.list_with_filters(status)",
+     lambda: DefaultApplicationDAO.list_with_filters(status='待审核', limit=20)),
+    ("DefaultApplicationDAO.list_with_filters(customer_id)",
+     lambda: DefaultApplicationDAO.list_with_filters(customer_id=PROBE_ID)),
+    ("DefaultApplicationDAO.list_with_filters(date range)",
+     lambda: DefaultApplicationDAO.list_with_filters(start_date='2000-01-01', end_date='2000-01-31')),
+    ("DefaultApplicationDAO.list_with_filters(customer_name)",
+     lambda: DefaultApplicationDAO.list_with_filters(customer_name='探测客户', limit=20)),
+    ("DefaultApplicationDAO.list_with_filters(reviewer)",
+     lambda: DefaultApplicationDAO.list_with_filters(reviewer='探测人员', limit=20)),
+    ("DefaultApplicationDAO.list_reviews(status)",
+     lambda: DefaultApplicationDAO.list_reviews(status='待审核', limit=20)),
+    ("DefaultApplicationDAO.list_reviews(customer_name)",
+     lambda: DefaultApplicationDAO.list_reviews(customer_name='探测客户', limit=20)),
+    ("DefaultApplicationDAO.list_reviews(reviewer)",
+     lambda: DefaultApplicationDAO.list_reviews(reviewer='探测人员', limit=20)),
+    ("DefaultApplicationDAO.get_reviews",
+     lambda: DefaultApplicationDAO.get_reviews([PROBE_ID, PROBE_ID + '2'])),
+    ("DefaultApplicationDAO.claim_pending",
+     rolled_back(lambda: DefaultApplicationDAO.claim_pending(PROBE_ID, 10, 60))),
+    ("DefaultApplicationDAO.iter_enriched(export)",
+     lambda: list(DefaultApplicationDAO.iter_enriched(start_date='2000-01-01', end_date='2000-01-31'))),
+    ("RecoveryApplicationDAO.get_by_id", lambda: RecoveryApplicationDAO.get_by_id(PROBE_ID)),
+    ("RecoveryApplicationDAO.get_many", lambda: RecoveryApplicationDAO.get_many([PROBE_ID, PROBE_ID + '2'])),
+    ("RecoveryApplicationDAO.list_with_filters(status)",
+     lambda: RecoveryApplicationDAO.list_with_filters(status='待审核', limit=20)),
+    ("RecoveryApplicationDAO.list_with_filters(customer_id)",
+     lambda: RecoveryApplicationDAO.list_with_filters(customer_id=PROBE_ID)),
+    ("RecoveryApplicationDAO.list_enriched(page)",
+     lambda: RecoveryApplicationDAO.list_enriched(limit=20, cursor=PROBE_CURSOR)),
+    ("RecoveryApplicationDAO.iter_enriched(export)",
+     lambda: list(RecoveryApplicationDAO.iter_enriched(start_date='2000-01-01', end_date='2000-01-31'))),
+]
+
+
+@contextmanager
+def capture_plans(plans):
+    """执行期间每条 SELECT 先执行 EXPLAIN，执行计划追加到 plans 中"""
+    original_execute = Database.execute
+
+    def explain_execute(self, sql, params=None):
+        if sql.lstrip().upper().startswith('SELECT'):
+            success, msg = original_execute(self, f"EXPLAIN {sql}", params)
+            if not success:
+                raise RuntimeError(msg)
+            plans.append((sql, self.fetchall()))
+        return original_execute(self, sql, params)
+
+    Database.execute = explain_execute
+    try:
+        yield plans
+    finally:
+        Database.execute = original_execute
+
+
+def find_full_scans(plan_rows):
+    """返回执行计划中对业务表做全表扫描的行"""
+    return [
+        row for row in plan_rows
+        if (row.get('type') or '').upper() == 'ALL' and row.get('table') not in SCAN_ALLOWED_TABLES
+    ]
+
+
+def mysql_available():
+    """能否连上 MySQL（连不上时测试跳过）"""
+    try:
+        pool = get_pool()
+        pool.release(pool.acquire())
+        return True
+    except Exception:
+        return False
+
+
+def clear_caches():
+    """清空缓存，保证查询真正落到数据库"""
+    CustomerDAO.invalidate_cache()
+    UserDAO.invalidate_cache()
+
+
+def check_query(name, call):
+    """
+    检查一个查询的执行计划
+    :return: 问题列表 [(查询名称, SQL, 全表扫描的执行计划行)]；没有捕获到任何查询时 SQL 为 None
+    """
+    plans = []
+    with capture_plans(plans):
+        call()
+    if not plans:
+        return [(name, None, [])]
+    problems = []
+    for sql, rows in plans:
+        scans = find_full_scans(rows)
+        if scans:
+            problems.append((name, sql, scans))
+    return problems
+
+
+def check_queries(queries=QUERIES):
+    """
+    检查全部查询的执行计划
+    :return: 问题列表，同 check_query
+    """
+    clear_caches()
+    problems = []
+    for name, call in queries:
+        problems.extend(check_query(name, call))
+    return problems
+
+
+def describe(problem):
+    """问题的可读描述"""
+    name, sql, scans = problem
+    if sql is None:
+        return f"[未执行] {name}: 没有捕获到任何查询"
+    tables = ', '.join(row.get('table') or '?' for row in scans)
+    return f"[全表扫描] {name}: {tables}\n    {' '.join(sql.split())}"
+
+
+if __name__ == '__main__':
+    problems = check_queries()
+    for problem in problems:
+        print(describe(problem))
+    print(f"检查 {len(QUERIES)} 个查询，发现 {len(problems)} 个问题")
+    sys.exit(1 if problems else 0)
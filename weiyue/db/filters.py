@@ -0,0 +1,107 @@
+"""
+申请列表的筛选条件（违约申请、重生申请共用）
+
+两张申请表的筛选字段相同：客户ID、客户名称、审核状态、申请时间范围、审核人，按 (apply_time, 主键) 倒序键集分页。
+约定申请表别名由调用方给出，客户表别名 ci、审核人表别名 ui。
+"""
+from functools import lru_cache
+
+from db.pagination import keyset_sql, keyset_params
+from db.search import substring_mode, substring_sql, substring_params
+
+
+@lru_cache(maxsize=512)
+def _filter_sql(alias, id_column, customer_id_count, customer_name_mode, has_status, has_start_date,
+                has_end_date, reviewer_mode, has_cursor):
+    """按启用的筛选条件组合生成 WHERE 之后追加的 SQL 片段，同一组合只生成一次"""
+    sql = ""
+    if customer_id_count == 1:
+        sql += f" AND {alias}.customer_id = %s"
+    elif customer_id_count > 1:
+        sql += f" AND {alias}.customer_id IN ({', '.join(['%s'] * customer_id_count)})"
+    if customer_name_mode:
+        sql += f" AND {substring_sql('ci.customer_name', customer_name_mode)}"
+    if has_status:
+        sql += f" AND {alias}.audit_status = %s"
+    if has_start_date:
+        sql += f" AND {alias}.apply_time >= %s"
+    if has_end_date:
+        sql += f" AND {alias}.apply_time <= %s"
+    if reviewer_mode:
+        sql += f" AND {substring_sql('ui.real_name', reviewer_mode)}"
+    # 键集分页：从游标位置之后继续读取，深翻页与首页代价相同
+    if has_cursor:
+        sql += f" AND {keyset_sql(f'{alias}.apply_time', f'{alias}.{id_column}')}"
+    return sql
+
+
+def filter_clause(alias, id_column, customer_name=None, status=None, start_date=None, end_date=None,
+                  reviewer=None, cursor=None, customer_id=None):
+    """
+    构建申请筛选条件
+    :param alias: 申请表别名
+    :param id_column: 申请表主键列（键集分页的第二排序键）
+    :param customer_id: 客户ID，或客户ID列表（单个ID用 =，多个ID用 IN）
+    :return: (WHERE 之后追加的 SQL 片段, 参数列表)；按空的客户ID列表筛选时返回 None
+    """
+    if isinstance(customer_id, (list, tuple, set)):
+        customer_ids = list(dict.fromkeys(customer_id))
+        if not customer_ids:
+            return None
+    else:
+        customer_ids = [customer_id] if customer_id else []
+    customer_name_mode = substring_mode(customer_name) if customer_name else None
+    reviewer_mode = substring_mode(reviewer) if reviewer else None
+
+    sql = _filter_sql(
+        alias, id_column, len(customer_ids), customer_name_mode, bool(status), bool(start_date),
+        bool(end_date), reviewer_mode, bool(cursor)
+    )
+    # 参数顺序与 _filter_sql 中条件的拼接顺序一致
+    params = customer_ids
+    if customer_name:
+        params.extend(substring_params(customer_name, customer_name_mode))
+    if status:
+        params.append(status)
+    if start_date:
+        params.append(f"{start_date} 00:00:00")
+    if end_date:
+        params.append(f"{end_date} 23:59:59")
+    if reviewer:
+        params.extend(substring_params(reviewer, reviewer_mode))
+    if cursor:
+        params.extend(keyset_params(cursor))
+    return sql, params
+
+
+def filter_joins(alias, customer_name=None, reviewer=None):
+    """只连接筛选条件用到的客户表、审核人表（不按名称、审核人筛选时为单表查询）"""
+    sql = ""
+    if customer_name:
+        sql += f" JOIN t_customer_info ci ON {alias}.customer_id = ci.customer_id"
+    if reviewer:
+        sql += f" JOIN t_user_info ui ON {alias}.auditor_id = ui.user_id"
+    return sql
+
+
+@lru_cache(maxsize=512)
+def _query_sql(select, clause, order_by, has_limit):
+    """拼接完整查询：SELECT ... WHERE 1=1 + 筛选条件 + 排序 + 分页（同一组合只拼接一次）"""
+    sql = f"{select} WHERE 1=1{clause} ORDER BY {order_by}"
+    if has_limit:
+        sql += " LIMIT %s"
+    return sql
+
+
+def build_query(select, filters, order_by, limit):
+    """
+    :param select: SELECT ... FROM ... JOIN ...（不含 WHERE）
+    :param filters: filter_clause 的返回值
+    :return: (SQL, 参数列表)；filters 为 None 时返回 None
+    """
+    if filters is None:
+        return None
+    clause, params = filters
+    if limit:
+        params.append(limit)
+    return _query_sql(select, clause, order_by, bool(limit)), params
@@ -2,6 +2,8 @@ from datetime import datetime
 
 class DefaultReason:
     """违约原因表(t_default_reason)实体类"""
+    __slots__ = ('reason_id', 'reason_content', 'is_enabled', 'create_time', 'update_time')
+
     def __init__(self, reason_id, reason_content, is_enabled, create_time, update_time=None):
         self.reason_id = reason_id  # 违约原因唯一标识
         self.reason_content = reason_content  # 违约原因具体描述
@@ -24,6 +26,8 @@ class DefaultReason:
 
 class RecoveryReason:
     """重生原因表(t_recovery_reason)实体类"""
+    __slots__ = ('recovery_id', 'recovery_content', 'is_enabled', 'create_time', 'update_time')
+
     def __init__(self, recovery_id, recovery_content, is_enabled, create_time, update_time=None):
         self.recovery_id = recovery_id  # 重生原因唯一标识
         self.recovery_content = recovery_content  # 重生原因具体描述
@@ -46,6 +50,9 @@ class RecoveryReason:
 
 class CustomerInfo:
     """客户信息表(t_customer_info)实体类"""
+    __slots__ = ('customer_id', 'customer_name', 'current_external_rating', 'industry_type',
+                 'region', 'is_default', 'create_time', 'update_time')
+
     def __init__(self, customer_id, customer_name, is_default, create_time, 
                  current_external_rating=None, industry_type=None, 
                  region=None, update_time=None):
@@ -76,10 +83,14 @@ class CustomerInfo:
 
 class DefaultApplication:
     """违约认定申请表(t_default_application)实体类"""
+    __slots__ = ('app_id', 'customer_id', 'default_reason_id', 'severity_level', 'remarks',
+                 'attachment_url', 'applicant_id', 'apply_time', 'audit_status', 'auditor_id',
+                 'audit_time', 'audit_remarks', 'claimed_by', 'claim_expires_at', 'version')
+
     def __init__(self, app_id, customer_id, default_reason_id, severity_level,
                  applicant_id, apply_time, audit_status, remarks=None,
                  attachment_url=None, auditor_id=None, audit_time=None,
-                 audit_remarks=None):
+                 audit_remarks=None, claimed_by=None, claim_expires_at=None, version=None):
         self.app_id = app_id  # 申请单唯一标识
         self.customer_id = customer_id  # 关联客户表的customer_id
         self.default_reason_id = default_reason_id  # 关联违约原因表的reason_id
@@ -92,6 +103,9 @@ class DefaultApplication:
         self.auditor_id = auditor_id  # 审核人ID（关联用户表）
         self.audit_time = audit_time  # 审核时间
         self.audit_remarks = audit_remarks  # 审核备注
+        self.claimed_by = claimed_by  # 领取人ID（审核队列，关联用户表）
+        self.claim_expires_at = claim_expires_at  # 领取租约到期时间
+        self.version = version  # 乐观锁版本号（每次审核加 1）
 
     def to_dict(self):
         return {
@@ -106,18 +120,38 @@ class DefaultApplication:
             'audit_status': self.audit_status,
             'auditor_id': self.auditor_id,
             'audit_time': self.audit_time,
-            'audit_remarks': self.audit_remarks
+            'audit_remarks': self.audit_remarks,
+            'claimed_by': self.claimed_by,
+            'claim_expires_at': self.claim_expires_at,
+            'version': self.version
         }
 
+    def is_claimed_by_other(self, auditor_id, now=None):
+        """
+        是否被其他审核人领取且租约未过期（与 DefaultApplicationDAO 的可领取条件 claim_expires_at < NOW() 相反）
+        :param now: 当前时间（datetime），默认取当前时间
+        """
+        if not self.claimed_by or self.claimed_by == auditor_id or not self.claim_expires_at:
+            return False
+        # 查询结果中的时间已格式化为 TIME_FORMAT 字符串，按字符串比较即按时间先后比较
+        expires_at = self.claim_expires_at
+        if isinstance(expires_at, datetime):
+            expires_at = format_datetime(expires_at)
+        return expires_at >= format_datetime(now or datetime.now())
+
     def __repr__(self):
         return f"<DefaultApplication {self.app_id}: Customer {self.customer_id}>"
 
 
 class RecoveryApplication:
     """违约重生申请表(t_recovery_application)实体类"""
+    __slots__ = ('recovery_app_id', 'customer_id', 'original_default_app_id', 'recovery_reason_id',
+                 'applicant_id', 'apply_time', 'audit_status', 'auditor_id', 'audit_time',
+                 'audit_remarks', 'version')
+
     def __init__(self, recovery_app_id, customer_id, original_default_app_id,
                  recovery_reason_id, applicant_id, apply_time, audit_status,
-                 auditor_id=None, audit_time=None, audit_remarks=None):
+                 auditor_id=None, audit_time=None, audit_remarks=None, version=None):
         self.recovery_app_id = recovery_app_id  # 重生申请单唯一标识
         self.customer_id = customer_id  # 关联客户表的customer_id
         self.original_default_app_id = original_default_app_id  # 关联原违约认定申请表的app_id
@@ -128,6 +162,7 @@ class RecoveryApplication:
         self.auditor_id = auditor_id  # 审核人ID（关联用户表）
         self.audit_time = audit_time  # 审核时间
         self.audit_remarks = audit_remarks  # 审核备注
+        self.version = version  # 乐观锁版本号（每次审核加 1）
 
     def to_dict(self):
         return {
@@ -140,7 +175,8 @@ class RecoveryApplication:
             'audit_status': self.audit_status,
             'auditor_id': self.auditor_id,
             'audit_time': self.audit_time,
-            'audit_remarks': self.audit_remarks
+            'audit_remarks': self.audit_remarks,
+            'version': self.version
         }
 
     def __repr__(self):
@@ -149,6 +185,9 @@ class RecoveryApplication:
 
 class UserInfo:
     """用户信息表(t_user_info)实体类"""
+    __slots__ = ('user_id', 'user_name', 'real_name', 'department', 'role', 'password',
+                 'phone', 'email', 'create_time', 'update_time')
+
     def __init__(self, user_id, user_name, real_name, department, role,
                  password, create_time, phone=None, email=None, update_time=None):
         self.user_id = user_id  # 用户唯一标识
@@ -179,6 +218,64 @@ class UserInfo:
         return f"<UserInfo {self.user_id}: {self.real_name}>"
 
 
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def format_datetime(value):
+    """datetime 格式化为 TIME_FORMAT 字符串（isoformat 与 strftime 结果相同，速度快得多）"""
+    return value.isoformat(' ', 'seconds')
+
+
+# 辅助函数：格式化查询结果中的时间字段
+def format_row(data):
+    """
+    将查询结果中的datetime字段格式化为字符串（原地修改）
+    :param data: 字典类型数据（通常是数据库查询结果）
+    :return: 格式化后的字典
+    """
+    if not data:
+        return data
+    for key, value in data.items():
+        if isinstance(value, datetime):
+            data[key] = format_datetime(value)
+    return data
+
+
+_row_mappers = {}
+
+
+def _build_row_mapper(model_class):
+    """
+    为模型类生成行映射函数：字段列表与槽描述符在这里一次性取好，
+    映射每一行时不再反射构造函数参数，也不经过 __init__
+    """
+    fields = tuple((name, getattr(model_class, name).__set__) for name in model_class.__slots__)
+    new = object.__new__
+
+    def map_row(row):
+        obj = new(model_class)
+        get = row.get
+        for name, set_field in fields:
+            value = get(name)
+            if value.__class__ is datetime:
+                value = format_datetime(value)
+            set_field(obj, value)
+        return obj
+
+    return map_row
+
+
+def row_mapper(model_class):
+    """
+    获取模型类的行映射函数（每个类只生成一次）
+    映射时只读取模型声明的字段，查询结果中多余的列被忽略，缺少的列为 None；datetime 格式化为字符串
+    """
+    mapper = _row_mappers.get(model_class)
+    if mapper is None:
+        mapper = _row_mappers.setdefault(model_class, _build_row_mapper(model_class))
+    return mapper
+
+
 # 辅助函数：将数据库查询结果转换为实体类对象
 def dict_to_model(data, model_class):
     """
@@ -189,12 +286,4 @@ def dict_to_model(data, model_class):
     """
     if not data:
         return None
-        
-    # 处理datetime类型字段
-    for key, value in data.items():
-        if isinstance(value, datetime):
-            data[key] = value.strftime('%Y-%m-%d %H:%M:%S')
-            
-    # 过滤掉模型类不接受的参数
-    params = {k: v for k, v in data.items() if k in model_class.__init__.__code__.co_varnames}
-    return model_class(**params)
+    return row_mapper(model_class)(data)
@@ -0,0 +1,63 @@
+import base64
+import json
+
+
+def encode_cursor(*values):
+    """将排序键值编码为不透明的分页游标"""
+    raw = json.dumps(list(values), ensure_ascii=False, default=str)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, size=2):
+    """
+    解析分页游标
+    :param cursor: encode_cursor 生成的游标字符串
+    :param size: 排序键个数
+    :return: 排序键值列表；游标非法时抛出 ValueError
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except Exception:
+        raise ValueError("分页游标无效")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("分页游标无效")
+    return values
+
+
+def next_cursor(items, limit, key):
+    """
+    根据本页结果生成下一页游标
+    :param items: 本页数据
+    :param limit: 每页条数（None 表示未分页）
+    :param key: 从一条数据中取出排序键元组的函数
+    :return: 下一页游标；本页不足 limit 条时返回 None
+    """
+    if not limit or len(items) < limit:
+        return None
+    return encode_cursor(*key(items[-1]))
+
+
+def keyset_clause(sort_column, id_column, cursor_values, nullable=False):
+    """
+    生成倒序键集分页条件：(sort_column, id_column) 严格小于游标位置
+    :param nullable: 排序列可为 NULL（倒序时 NULL 排在最后）
+    :return: (SQL 片段, 参数列表)
+    """
+    sort_value, id_value = cursor_values
+    if nullable and sort_value is None:
+        return f"({sort_column} IS NULL AND {id_column} < %s)", [id_value]
+    return keyset_sql(sort_column, id_column, nullable), keyset_params(cursor_values)
+
+
+def keyset_sql(sort_column, id_column, nullable=False):
+    """排序列非空时的倒序键集分页条件（只与列名有关，可缓存），参数见 keyset_params"""
+    clause = f"({sort_column} < %s OR ({sort_column} = %s AND {id_column} < %s)"
+    if nullable:
+        clause += f" OR {sort_column} IS NULL"
+    return clause + ")"
+
+
+def keyset_params(cursor_values):
+    """keyset_sql 对应的参数"""
+    sort_value, id_value = cursor_values
+    return [sort_value, sort_value, id_value]
@@ -0,0 +1,216 @@
+import threading
+import time
+from collections import deque
+
+import pymysql
+from pymysql.constants import CLIENT, SERVER_STATUS
+from pymysql.cursors import DictCursor
+from config import DB_CONFIG, POOL_CONFIG
+
+
+class PoolTimeoutError(Exception):
+    """连接池在等待时间内没有可用连接"""
+
+
+class ConnectionPool:
+    """有界数据库连接池，支持最小/最大连接数、借出超时、预检(pre-ping)与过期回收"""
+
+    def __init__(self, creator, min_size=1, max_size=10, timeout=10,
+                 recycle=3600, pre_ping=True):
+        self._creator = creator
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._lock = threading.Condition()
+        self._idle = deque()       # (connection, created_at)，后进先出
+        self._created_at = {}      # id(connection) -> 创建时间（含已借出的连接）
+        self._size = 0             # 当前已创建的连接总数
+
+        # 饱和度指标
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+        self._peak_in_use = 0
+
+        self._fill_min()
+
+    def _fill_min(self):
+        """预先建立 min_size 个连接"""
+        for _ in range(self.min_size):
+            with self._lock:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._creator()
+            except Exception:
+                # 预热失败不影响启动，后续按需建立连接
+                with self._lock:
+                    self._size -= 1
+                return
+            with self._lock:
+                now = time.monotonic()
+                self._created_at[id(conn)] = now
+                self._idle.append((conn, now))
+                self._lock.notify()
+
+    def _discard(self, conn):
+        """关闭连接并释放其占用的名额（调用方需持有锁）"""
+        self._created_at.pop(id(conn), None)
+        self._size -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._lock.notify()
+
+    def _is_usable(self, conn, created_at):
+        """检查空闲连接是否可复用：未超过回收时间且 ping 通过"""
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            return False
+        if self.pre_ping:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                return False
+        return True
+
+    @staticmethod
+    def _in_transaction(conn):
+        """连接上是否还有未结束的事务（无法判断时按有事务处理）"""
+        status = getattr(conn, 'server_status', None)
+        if status is None:
+            return True
+        return bool(status & SERVER_STATUS.SERVER_STATUS_IN_TRANS)
+
+    def acquire(self):
+        """借出一个连接，池满时最多等待 timeout 秒"""
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"获取数据库连接超时（{self.timeout}s，最大连接数 {self.max_size}）"
+                        )
+                    if not waited:
+                        waited = True
+                        self._waits += 1
+                    self._lock.wait(remaining)
+
+                if self._idle:
+                    conn, created_at = self._idle.pop()
+                else:
+                    conn, created_at = None, None
+                    self._size += 1
+
+            if conn is not None:
+                # ping 可能涉及网络往返，放在锁外执行
+                if not self._is_usable(conn, created_at):
+                    with self._lock:
+                        self._discard(conn)
+                    continue
+            else:
+                try:
+                    conn = self._creator()
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    raise
+                with self._lock:
+                    self._created_at[id(conn)] = time.monotonic()
+
+            with self._lock:
+                self._checkouts += 1
+                if waited:
+                    self._wait_time += time.monotonic() - start
+                in_use = self._size - len(self._idle)
+                self._peak_in_use = max(self._peak_in_use, in_use)
+            return conn
+
+    def release(self, conn, discard=False):
+        """归还连接；未提交的事务会被回滚，失效连接直接丢弃"""
+        if not discard and self._in_transaction(conn):
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+        with self._lock:
+            if id(conn) not in self._created_at:
+                return
+            if discard:
+                self._discard(conn)
+                return
+            self._idle.append((conn, self._created_at[id(conn)]))
+            self._lock.notify()
+
+    def close_all(self):
+        """关闭所有空闲连接（已借出的连接在归还后正常处理）"""
+        with self._lock:
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+
+    def stats(self):
+        """连接池饱和度指标"""
+        with self._lock:
+            idle = len(self._idle)
+            return {
+                'size': self._size,
+                'idle': idle,
+                'in_use': self._size - idle,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'peak_in_use': self._peak_in_use,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'avg_wait_ms': round(self._wait_time / self._waits * 1000, 2) if self._waits else 0.0
+            }
+
+
+def create_connection():
+    """按配置建立一个新的 MySQL 连接"""
+    return pymysql.connect(
+        host=DB_CONFIG['host'],
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password'],
+        database=DB_CONFIG['database'],
+        port=DB_CONFIG['port'],
+        charset=DB_CONFIG['charset'],
+        cursorclass=DictCursor,
+        # UPDATE 的 rowcount 返回匹配行数而不是实际改变的行数，条件更新可据此判断是否命中
+        client_flag=CLIENT.FOUND_ROWS,
+        use_unicode=True,
+        init_command="SET NAMES utf8mb4"
+    )
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """获取进程内共享的连接池（首次调用时创建）"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    create_connection,
+                    min_size=POOL_CONFIG['min_size'],
+                    max_size=POOL_CONFIG['max_size'],
+                    timeout=POOL_CONFIG['timeout'],
+                    recycle=POOL_CONFIG['recycle'],
+                    pre_ping=POOL_CONFIG['pre_ping']
+                )
+    return _pool
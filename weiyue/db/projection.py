@@ -0,0 +1,143 @@
+"""
+查询结果到接口响应的投影
+
+每个列表接口的响应字段在这里声明一次：响应字段名 -> 查询结果列名（或由一行计算取值的函数）。
+投影直接作用于游标返回的行字典，每行只生成一次响应字典，不经过实体对象和 to_dict。
+"""
+from operator import itemgetter
+
+# 接口状态值 -> 库中审核状态
+STATUS_MAP = {
+    'pending': '待审核',
+    'approved': '同意',
+    'rejected': '拒绝'
+}
+
+# 库中审核状态 -> 接口状态值
+STATUS_LABELS = {value: key for key, value in STATUS_MAP.items()}
+
+
+def to_db_status(status):
+    """接口状态值转换为库中审核状态，无法识别的值原样返回"""
+    return STATUS_MAP.get(status, status) if status else status
+
+
+def status_label(audit_status):
+    """库中审核状态转换为接口状态值（待审核/同意 以外均视为 rejected）"""
+    return STATUS_LABELS.get(audit_status, 'rejected')
+
+
+def status_of(column):
+    """取值函数：审核状态列转换为接口状态值"""
+    get = itemgetter(column)
+    return lambda row: status_label(get(row))
+
+
+def coalesce(*columns, default=None):
+    """取值函数：依次取各列，返回第一个非空值，都为空时返回 default"""
+    getters = tuple(itemgetter(column) for column in columns)
+
+    def get(row):
+        for getter in getters:
+            value = getter(row)
+            if value:
+                return value
+        return default
+
+    return get
+
+
+class Projection:
+    """声明式的行到响应字典映射"""
+
+    def __init__(self, fields):
+        """
+        :param fields: [(响应字段名, 来源)]，来源为列名或接收一行、返回字段值的函数；响应字段按声明顺序输出
+        """
+        self.fields = tuple(
+            (name, itemgetter(source) if isinstance(source, str) else source)
+            for name, source in fields
+        )
+
+    def project(self, row):
+        """映射单行"""
+        return {name: get(row) for name, get in self.fields}
+
+    def project_all(self, rows):
+        """映射多行"""
+        project = self.project
+        return [project(row) for row in rows]
+
+
+# 违约审核列表（DefaultApplicationDAO.list_reviews）
+DEFAULT_REVIEW_PROJECTION = Projection([
+    ('id', 'app_id'),
+    ('applicationId', 'app_id'),
+    ('customerName', coalesce('customer_name', 'customer_id')),
+    ('reasons', lambda row: [row['reason_content'] or row['default_reason_id']]),
+    ('severity', 'severity_level'),
+    ('applyTime', 'apply_time'),
+    ('status', status_of('audit_status')),
+    ('reviewer', coalesce('auditor_name', 'auditor_id', default='')),
+    ('reviewTime', coalesce('audit_time', default='')),
+    ('reviewRemark', coalesce('audit_remarks', default='')),
+    # 领取信息（未迁移领取列的库中为空）
+    ('claimedBy', lambda row: row.get('claimed_by')),
+    ('claimExpiresAt', lambda row: row.get('claim_expires_at')),
+    # 乐观锁版本号，审核时回传（未迁移版本号列的库中为空）
+    ('version', lambda row: row.get('version')),
+])
+
+# 违约申请列表（违约申请行，附带 customer_name、reason_content、applicant_name、auditor_name）
+DEFAULT_APPLICATION_PROJECTION = Projection([
+    ('id', 'app_id'),
+    ('applicationId', 'app_id'),
+    ('customerName', coalesce('customer_name', 'customer_id')),
+    ('customerId', 'customer_id'),
+    ('reasons', lambda row: [row['reason_content'] or row['default_reason_id']]),
+    ('reasonId', 'default_reason_id'),
+    ('severity', 'severity_level'),
+    ('remarks', coalesce('remarks', default='')),
+    ('applicant', coalesce('applicant_name', 'applicant_id')),
+    ('applicantId', 'applicant_id'),
+    ('applyTime', 'apply_time'),
+    ('status', status_of('audit_status')),
+    ('auditStatus', 'audit_status'),
+    ('reviewer', coalesce('auditor_name', 'auditor_id', default='')),
+    ('reviewerId', 'auditor_id'),
+    ('reviewTime', coalesce('audit_time', default='')),
+    ('reviewRemark', coalesce('audit_remarks', default='')),
+    ('attachmentUrl', coalesce('attachment_url', default='')),
+    ('version', lambda row: row.get('version')),
+])
+
+
+def _original_reason(row):
+    """原违约原因（关联不到原违约申请时为空）"""
+    if row['original_default_app_id'] and row['original_app_id']:
+        return row['original_reason_content'] or row['original_reason_id']
+    return ''
+
+
+def _original_severity(row):
+    """原违约严重性（关联不到原违约申请时为 medium）"""
+    if row['original_default_app_id'] and row['original_app_id']:
+        return row['original_severity_level']
+    return 'medium'
+
+
+# 重生申请列表（RecoveryApplicationDAO.list_enriched）
+RECOVERY_APPLICATION_PROJECTION = Projection([
+    ('id', 'recovery_app_id'),
+    ('customerName', lambda row: row['customer_id'] if row['customer_name'] is None else row['customer_name']),
+    ('originalReason', _original_reason),
+    ('rebirthReason', coalesce('recovery_content', 'recovery_reason_id', default='')),
+    ('severity', _original_severity),
+    ('status', status_of('audit_status')),
+    ('applyTime', 'apply_time'),
+    ('reviewer', coalesce('auditor_name', 'auditor_id', default='')),
+    ('reviewTime', coalesce('audit_time', default='')),
+    ('reviewRemark', coalesce('audit_remarks', default='')),
+    ('externalLevel', lambda row: '' if row['customer_name'] is None else row['current_external_rating']),
+    ('version', lambda row: row.get('version')),
+])
@@ -0,0 +1,300 @@
+"""
+数据库结构版本管理
+
+按版本号顺序执行迁移，已执行的版本记录在 t_schema_version 中，重复执行是安全的。
+用法（在 weiyue 目录下）：
+    python -m db.schema            # 迁移到最新版本
+    python -m db.schema --status   # 查看当前版本
+"""
+import sys
+
+from db.base import Database
+
+SCHEMA_VERSION_DDL = """
+CREATE TABLE IF NOT EXISTS t_schema_version (
+    version INT NOT NULL PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+ID_SEQUENCE_DDL = """
+CREATE TABLE IF NOT EXISTS t_id_sequence (
+    seq_name VARCHAR(64) NOT NULL PRIMARY KEY,
+    next_val BIGINT UNSIGNED NOT NULL,
+    update_time DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+# 版本 1：业务表（与既有库结构一致，已存在的表不做改动）
+BASE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS t_default_reason (
+        reason_id VARCHAR(32) NOT NULL PRIMARY KEY,
+        reason_content VARCHAR(255) NOT NULL,
+        is_enabled TINYINT(1) NOT NULL DEFAULT 1,
+        create_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        update_time DATETIME NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS t_recovery_reason (
+        recovery_id VARCHAR(32) NOT NULL PRIMARY KEY,
+        recovery_content VARCHAR(255) NOT NULL,
+        is_enabled TINYINT(1) NOT NULL DEFAULT 1,
+        create_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        update_time DATETIME NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS t_customer_info (
+        customer_id VARCHAR(32) NOT NULL PRIMARY KEY,
+        customer_name VARCHAR(128) NOT NULL,
+        current_external_rating VARCHAR(16) NULL,
+        industry_type VARCHAR(64) NULL,
+        region VARCHAR(64) NULL,
+        is_default TINYINT(1) NOT NULL DEFAULT 0,
+        create_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        update_time DATETIME NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS t_user_info (
+        user_id VARCHAR(32) NOT NULL PRIMARY KEY,
+        user_name VARCHAR(64) NOT NULL,
+        real_name VARCHAR(64) NOT NULL,
+        department VARCHAR(64) NULL,
+        role VARCHAR(16) NULL,
+        password VARCHAR(64) NOT NULL DEFAULT '',
+        phone VARCHAR(32) NULL,
+        email VARCHAR(128) NULL,
+        create_time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        update_time DATETIME NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS t_default_application (
+        app_id VARCHAR(32) NOT NULL PRIMARY KEY,
+        customer_id VARCHAR(32) NOT NULL,
+        default_reason_id VARCHAR(32) NOT NULL,
+        severity_level VARCHAR(16) NOT NULL,
+        remarks VARCHAR(1000) NULL,
+        attachment_url VARCHAR(255) NULL,
+        applicant_id VARCHAR(32) NOT NULL,
+        apply_time DATETIME NOT NULL,
+        audit_status VARCHAR(8) NOT NULL DEFAULT '待审核',
+        auditor_id VARCHAR(32) NULL,
+        audit_time DATETIME NULL,
+        audit_remarks VARCHAR(1000) NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS t_recovery_application (
+        recovery_app_id VARCHAR(32) NOT NULL PRIMARY KEY,
+        customer_id VARCHAR(32) NOT NULL,
+        original_default_app_id VARCHAR(32) NULL,
+        recovery_reason_id VARCHAR(32) NOT NULL,
+        applicant_id VARCHAR(32) NOT NULL,
+        apply_time DATETIME NOT NULL,
+        audit_status VARCHAR(8) NOT NULL DEFAULT '待审核',
+        auditor_id VARCHAR(32) NULL,
+        audit_time DATETIME NULL,
+        audit_remarks VARCHAR(1000) NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    ID_SEQUENCE_DDL,
+]
+
+# 版本 2：热点查询所需索引 (表名, 索引名, 列)
+# InnoDB 二级索引隐含主键列，(apply_time) 等索引可直接支撑 (apply_time, 主键) 的键集分页
+QUERY_INDEXES = [
+    ("t_default_application", "idx_da_status_apply", "audit_status, apply_time"),
+    ("t_default_application", "idx_da_customer_apply", "customer_id, apply_time"),
+    ("t_default_application", "idx_da_apply_time", "apply_time"),
+    ("t_default_application", "idx_da_auditor", "auditor_id"),
+    ("t_recovery_application", "idx_ra_status_apply", "audit_status, apply_time"),
+    ("t_recovery_application", "idx_ra_customer_apply", "customer_id, apply_time"),
+    ("t_recovery_application", "idx_ra_apply_time", "apply_time"),
+    ("t_recovery_application", "idx_ra_auditor", "auditor_id"),
+    ("t_customer_info", "idx_ci_default_update", "is_default, update_time"),
+    ("t_customer_info", "idx_ci_create_time", "create_time"),
+    ("t_customer_info", "idx_ci_update_time", "update_time"),
+    ("t_user_info", "idx_ui_user_name", "user_name"),
+]
+
+# 版本 3：客户名称、审核人姓名的 n-gram 全文索引，支撑中文子串搜索 (表名, 索引名, 列)
+FULLTEXT_INDEXES = [
+    ("t_customer_info", "ft_ci_customer_name", "customer_name"),
+    ("t_user_info", "ft_ui_real_name", "real_name"),
+]
+
+# 版本 4：违约申请领取租约（审核队列），领取人 + 租约到期时间 (表名, 列名, 列定义)
+CLAIM_COLUMNS = [
+    ("t_default_application", "claimed_by", "VARCHAR(32) NULL"),
+    ("t_default_application", "claim_expires_at", "DATETIME NULL"),
+]
+CLAIM_INDEXES = [
+    ("t_default_application", "idx_da_claimed_by", "claimed_by"),
+]
+
+# ID 序列：(序列名/ID 前缀, 表名, ID 列)，序列行在迁移中按现有数据的最大序号初始化
+SEQUENCES = [
+    ("DEF", "t_default_application", "app_id"),
+    ("REC", "t_recovery_application", "recovery_app_id"),
+]
+
+# 乐观锁版本号：审核时按 WHERE version = 读取时的版本 更新，并发审核只有一方成功
+VERSION_COLUMNS = [
+    ("t_default_application", "version", "INT NOT NULL DEFAULT 0"),
+    ("t_recovery_application", "version", "INT NOT NULL DEFAULT 0"),
+]
+
+
+def ensure_column(db, table_name, column_name, definition):
+    """列不存在时添加"""
+    success, msg = db.execute(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s LIMIT 1",
+        (table_name, column_name)
+    )
+    if not success:
+        return False, msg
+    if db.fetchone():
+        return True, None
+    return db.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {definition}")
+
+
+def ensure_index(db, table_name, index_name, columns, index_type="INDEX", options=""):
+    """索引不存在时创建（兼容已手工建过同名索引的库）"""
+    success, msg = db.execute(
+        "SELECT 1 FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1",
+        (table_name, index_name)
+    )
+    if not success:
+        return False, msg
+    if db.fetchone():
+        return True, None
+    return db.execute(f"ALTER TABLE {table_name} ADD {index_type} {index_name} ({columns}) {options}")
+
+
+def _create_base_tables(db):
+    for ddl in BASE_TABLES:
+        success, msg = db.execute(ddl)
+        if not success:
+            return False, msg
+    return True, None
+
+
+def _create_query_indexes(db):
+    for table_name, index_name, columns in QUERY_INDEXES:
+        success, msg = ensure_index(db, table_name, index_name, columns)
+        if not success:
+            return False, msg
+    return True, None
+
+
+def _create_fulltext_indexes(db):
+    for table_name, index_name, columns in FULLTEXT_INDEXES:
+        success, msg = ensure_index(db, table_name, index_name, columns, "FULLTEXT", "WITH PARSER ngram")
+        if not success:
+            return False, msg
+    return True, None
+
+
+def _add_claim_columns(db):
+    for table_name, column_name, definition in CLAIM_COLUMNS:
+        success, msg = ensure_column(db, table_name, column_name, definition)
+        if not success:
+            return False, msg
+    for table_name, index_name, columns in CLAIM_INDEXES:
+        success, msg = ensure_index(db, table_name, index_name, columns)
+        if not success:
+            return False, msg
+    return True, None
+
+
+def _add_version_columns(db):
+    for table_name, column_name, definition in VERSION_COLUMNS:
+        success, msg = ensure_column(db, table_name, column_name, definition)
+        if not success:
+            return False, msg
+    return True, None
+
+
+def _seed_sequences(db):
+    for seq_name, table_name, id_column in SEQUENCES:
+        # 以数字方式取前缀后的最大序号；已存在的序列行（旧版本运行时初始化的）保持不变
+        success, msg = db.execute(
+            f"INSERT IGNORE INTO t_id_sequence (seq_name, next_val) "
+            f"SELECT %s, COALESCE(MAX(CAST(SUBSTRING({id_column}, %s) AS UNSIGNED)), 0) + 1 "
+            f"FROM {table_name} WHERE {id_column} LIKE %s",
+            (seq_name, len(seq_name) + 1, f"{seq_name}%")
+        )
+        if not success:
+            return False, msg
+    return True, None
+
+
+# 迁移列表：(版本号, 描述, 执行函数)，只能追加，不能修改已发布的版本
+MIGRATIONS = [
+    (1, "创建业务表与序列表", _create_base_tables),
+    (2, "创建热点查询索引", _create_query_indexes),
+    (3, "创建名称全文索引（ngram）", _create_fulltext_indexes),
+    (4, "违约申请增加领取租约列", _add_claim_columns),
+    (5, "申请表增加乐观锁版本号列", _add_version_columns),
+    (6, "初始化申请ID序列", _seed_sequences),
+]
+
+
+def current_version(db):
+    """获取数据库当前结构版本，未初始化时返回 0"""
+    success, msg = db.execute(SCHEMA_VERSION_DDL)
+    if not success:
+        raise RuntimeError(f"创建版本表失败: {msg}")
+    success, msg = db.execute("SELECT COALESCE(MAX(version), 0) AS version FROM t_schema_version")
+    if not success:
+        raise RuntimeError(f"查询结构版本失败: {msg}")
+    return int(db.fetchone()['version'])
+
+
+def migrate(target=None):
+    """
+    执行尚未应用的迁移
+    :param target: 目标版本，None 表示最新版本
+    :return: 本次应用的版本号列表
+    """
+    db = Database(join_transaction=False)
+    try:
+        version = current_version(db)
+        applied = []
+        for number, description, step in MIGRATIONS:
+            if number <= version or (target is not None and number > target):
+                continue
+            # DDL 在 MySQL 中会隐式提交，每个版本执行完成后立即记录
+            success, msg = step(db)
+            if not success:
+                raise RuntimeError(f"迁移到版本 {number} 失败: {msg}")
+            success, msg = db.execute(
+                "INSERT INTO t_schema_version (version, description) VALUES (%s, %s)",
+                (number, description)
+            )
+            if not success:
+                raise RuntimeError(f"记录版本 {number} 失败: {msg}")
+            db.commit()
+            applied.append(number)
+        return applied
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    if '--status' in sys.argv:
+        db = Database(join_transaction=False)
+        try:
+            print(f"当前结构版本: {current_version(db)}，最新版本: {MIGRATIONS[-1][0]}")
+        finally:
+            db.close()
+    else:
+        applied = migrate()
+        print(f"已应用版本: {applied}" if applied else "数据库结构已是最新版本")
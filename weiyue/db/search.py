@@ -0,0 +1,42 @@
+from config import SEARCH_CONFIG
+
+
+def substring_mode(keyword):
+    """
+    判断关键词的匹配方式：不短于 ngram_token_size 时走全文索引（'fulltext'），否则退回 LIKE（'like'）
+    """
+    phrase = _phrase(keyword)
+    if not SEARCH_CONFIG['fulltext'] or len(phrase) < SEARCH_CONFIG['ngram_token_size']:
+        return 'like'
+    return 'fulltext'
+
+
+def substring_sql(column, mode):
+    """按匹配方式生成条件 SQL 片段（只与列名和匹配方式有关，可缓存）"""
+    if mode == 'fulltext':
+        return f"MATCH({column}) AGAINST(%s IN BOOLEAN MODE) AND {column} LIKE %s"
+    return f"{column} LIKE %s"
+
+
+def substring_params(keyword, mode):
+    """按匹配方式生成条件参数"""
+    if mode == 'fulltext':
+        return [f'"{_phrase(keyword)}"', f"%{keyword}%"]
+    return [f"%{keyword}%"]
+
+
+def _phrase(keyword):
+    """去掉布尔模式下有特殊含义的双引号，整个关键词作为一个短语检索"""
+    return keyword.replace('"', ' ').strip()
+
+
+def substring_clause(column, keyword):
+    """
+    生成名称子串匹配条件
+    关键词不短于 ngram_token_size 时先用 ngram 全文索引（MATCH ... AGAINST 短语检索）缩小范围，
+    再用 LIKE 精确校验；过短的关键词无法走全文索引，退回 LIKE
+    :param column: 建有 ngram 全文索引的列（如 ci.customer_name、ui.real_name）
+    :return: (SQL 片段, 参数列表)
+    """
+    mode = substring_mode(keyword)
+    return substring_sql(column, mode), substring_params(keyword, mode)
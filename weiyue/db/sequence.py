@@ -0,0 +1,77 @@
+import threading
+
+from db.base import Database
+from config import SEQUENCE_CONFIG
+
+
+class SequenceAllocator:
+    """
+    基于序列表 t_id_sequence 的 ID 分配器（hi-lo 号段）
+    每次在数据库中原子地预留 block_size 个序号，进程内在号段内分配，号段用完再预留下一段；
+    多进程、多节点之间号段互不重叠，不会产生重复 ID（进程重启会留下未用完的空号）
+    序列行由 db.schema 迁移初始化（见 SEQUENCES）；预留号段会借用一个连接池连接，
+    调用方应在进入工作单元之前获取序号，避免同时占用两个连接
+    """
+
+    def __init__(self, block_size=20):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._blocks = {}          # 序列名 -> [下一个可用序号, 号段上界（不含）]
+
+    def _reserve(self, name, count):
+        """
+        在数据库中原子预留 count 个序号（只更新已存在的序列行，不在运行时插入，避免并发初始化时的间隙锁死锁）
+        :return: 预留号段的起始序号
+        """
+        # 序号预留独立提交，不加入调用方的工作单元，避免长时间持有序列行锁
+        db = Database(join_transaction=False)
+        try:
+            # LAST_INSERT_ID(expr) 让自增后的值随 OK 包返回，无需再查询一次
+            sql = ("UPDATE t_id_sequence SET next_val = LAST_INSERT_ID(next_val + %s) "
+                   "WHERE seq_name = %s")
+            success, msg = db.execute(sql, (count, name))
+            if not success:
+                db.rollback()
+                raise RuntimeError(f"预留序号失败: {msg}")
+            if not db.get_rowcount():
+                raise RuntimeError(f"序列 {name} 未初始化，请先执行 python -m db.schema")
+            high = db.get_lastrowid()
+            db.commit()
+            return high - count
+        finally:
+            db.close()
+
+    def next_value(self, name):
+        """获取序列的下一个序号"""
+        with self._lock:
+            block = self._blocks.get(name)
+            if block is None or block[0] >= block[1]:
+                start = self._reserve(name, self.block_size)
+                block = [start, start + self.block_size]
+                self._blocks[name] = block
+            value = block[0]
+            block[0] += 1
+            return value
+
+    def next_block(self, name, count):
+        """
+        一次获取 count 个连续序号（批量创建时使用）
+        当前号段剩余足够时直接从中分配，否则在数据库中单独预留一段，当前号段保留给后续的单个分配
+        :return: 序号范围 range
+        """
+        with self._lock:
+            block = self._blocks.get(name)
+            if block is not None and block[1] - block[0] >= count:
+                start = block[0]
+                block[0] += count
+            else:
+                start = self._reserve(name, count)
+            return range(start, start + count)
+
+
+_allocator = SequenceAllocator(block_size=SEQUENCE_CONFIG['block_size'])
+
+
+def get_allocator():
+    """获取进程内共享的序号分配器"""
+    return _allocator
@@ -5,9 +5,40 @@ from dao.UserDAO import UserDAO
 from dao.DefaultReasonDAO import DefaultReasonDAO
 from dao.RecoveryReasonDAO import RecoveryReasonDAO
 from db.models import DefaultApplication, RecoveryApplication
+from db.base import ConflictError, unit_of_work
 from services.base_service import BaseService
+from config import CLAIM_CONFIG
 from datetime import datetime
 
+# 批量创建时逐条校验的字段：(字段名, 显示名, 是否必填, 最大长度)，与 t_default_application 的列定义一致
+DEFAULT_APPLICATION_FIELDS = [
+    ('customer_id', '客户ID', True, 32),
+    ('default_reason_id', '违约原因', True, 32),
+    ('severity_level', '违约严重性', True, 16),
+    ('applicant_id', '申请人', True, 32),
+    ('remarks', '备注', False, 1000),
+    ('attachment_url', '附件路径', False, 255),
+]
+
+
+def _check_fields(item, fields):
+    """
+    按字段定义校验一条数据（必填、类型、长度）
+    :return: 第一个不通过的错误信息，全部通过时返回 None
+    """
+    for name, label, required, max_length in fields:
+        value = item.get(name)
+        if value is None or value == '':
+            if required:
+                return f"{label}不能为空"
+            continue
+        if not isinstance(value, str):
+            return f"{label}必须是字符串"
+        if len(value) > max_length:
+            return f"{label}长度不能超过 {max_length}"
+    return None
+
+
 class ApplicationService(BaseService):
     """申请管理服务，处理违约和重生申请的创建与审核"""
     
@@ -15,86 +46,161 @@ class ApplicationService(BaseService):
                                    applicant_id, remarks=None, attachment_url=None):
         """创建违约认定申请"""
         try:
-            # 验证客户是否存在
-            customer = CustomerDAO.get_by_id(customer_id)
-            if not customer:
-                self.logger.error(f"创建违约申请失败：客户 {customer_id} 不存在")
-                return False
-                
-            # 验证违约原因是否存在
-            reason = DefaultReasonDAO.get_by_id(default_reason_id)
-            if not reason:
-                self.logger.error(f"创建违约申请失败：违约原因 {default_reason_id} 不存在")
-                return False
-                
-            # 验证申请人是否存在，如果不存在则创建默认用户
-            user = UserDAO.get_by_id(applicant_id)
-            if not user:
-                self.logger.warning(f"申请人 {applicant_id} 不存在，正在创建默认用户")
-                # 创建默认用户
-                success = self.create_default_user(applicant_id)
-                if not success:
-                    self.logger.error(f"创建违约申请失败：无法创建默认用户 {applicant_id}")
+            # 在进入工作单元之前生成申请ID：预留新号段需要借用一个连接（校验不通过时会留下空号）
+            app_id = self.generate_id("DEF", self.get_next_sequence("DEF"))
+            with unit_of_work() as uow:
+                # 验证客户是否存在
+                customer = CustomerDAO.get_by_id(customer_id)
+                if not customer:
+                    self.logger.error(f"创建违约申请失败：客户 {customer_id} 不存在")
                     return False
-                self.logger.info(f"默认用户 {applicant_id} 创建成功")
                 
-            # 生成申请ID
-            sequence = self.get_next_sequence(
-                "t_default_application", "app_id", "DEF"
-            )
-            app_id = self.generate_id("DEF", sequence)
-            
-            # 创建申请对象
-            application = DefaultApplication(
-                app_id=app_id,
-                customer_id=customer_id,
-                default_reason_id=default_reason_id,
-                severity_level=severity_level,
-                applicant_id=applicant_id,
-                apply_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                audit_status="待审核",
-                remarks=remarks,
-                attachment_url=attachment_url
-            )
-            # 调试：输出申请对象的完整内容
-            self.logger.debug(f"创建违约申请对象: {application.to_dict()}")
+                # 验证违约原因是否存在
+                reason = DefaultReasonDAO.get_by_id(default_reason_id)
+                if not reason:
+                    self.logger.error(f"创建违约申请失败：违约原因 {default_reason_id} 不存在")
+                    return False
+                
+                # 验证申请人是否存在，如果不存在则创建默认用户
+                user = UserDAO.get_by_id(applicant_id)
+                if not user:
+                    self.logger.warning(f"申请人 {applicant_id} 不存在，正在创建默认用户")
+                    # 创建默认用户
+                    success = self.create_default_user(applicant_id)
+                    if not success:
+                        self.logger.error(f"创建违约申请失败：无法创建默认用户 {applicant_id}")
+                        return False
+                    self.logger.info(f"默认用户 {applicant_id} 创建成功")
+                
+                # 创建申请对象
+                application = DefaultApplication(
+                    app_id=app_id,
+                    customer_id=customer_id,
+                    default_reason_id=default_reason_id,
+                    severity_level=severity_level,
+                    applicant_id=applicant_id,
+                    apply_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    audit_status="待审核",
+                    remarks=remarks,
+                    attachment_url=attachment_url
+                )
+                # 调试：输出申请对象的完整内容
+                self.logger.debug(f"创建违约申请对象: {application.to_dict()}")
+                
+                # 保存到数据库
+                success, msg = DefaultApplicationDAO.create(application)
+                
+                if success:
+                    # 创建成功后，立即将客户状态更新为违约（与申请写入同一事务）
+                    if not CustomerDAO.update_default_status(customer_id, 1):
+                        uow.set_rollback_only()
+                        self.logger.error(f"违约申请 {app_id} 创建失败：客户 {customer_id} 状态更新失败")
+                        return False
+                    self.logger.info(f"违约申请 {app_id} 创建成功，客户 {customer_id} 状态已更新为违约")
+                else:
+                    self.logger.error(f"违约申请 {app_id} 创建失败，原因: {msg}")
+                
+                return success
+                
+        except Exception as e:
+            self.logger.error(f"创建违约申请失败: {str(e)}")
+            return False
+    
+    def create_default_applications(self, items):
+        """
+        批量创建违约认定申请：客户、违约原因、申请人按集合批量校验，一次预留整段申请ID，
+        executemany 批量写入，一条语句将相关客户更新为违约，整体一次提交
+        :param items: 字典列表，字段同 create_default_application 的参数
+        :return: (success, 逐条结果列表 或 错误信息)；校验不通过的条目不写入，其余照常创建
+        """
+        try:
+            # 先逐条校验必填字段、类型与长度：任一条写入失败都会使整批 executemany 回滚
+            field_errors = [_check_fields(item, DEFAULT_APPLICATION_FIELDS) for item in items]
+            checked = [item for item, error in zip(items, field_errors) if error is None]
             
-            # 保存到数据库
-            success, msg = DefaultApplicationDAO.create(application)
+            # 按集合批量校验客户、违约原因、申请人
+            customers = CustomerDAO.get_many(item['customer_id'] for item in checked)
+            reasons = DefaultReasonDAO.get_many(item['default_reason_id'] for item in checked)
+            users = UserDAO.get_many(item['applicant_id'] for item in checked)
             
-            if success:
-                # 创建成功后，立即将客户状态更新为违约
-                CustomerDAO.update_default_status(customer_id, 1)
-                self.logger.info(f"违约申请 {app_id} 创建成功，客户 {customer_id} 状态已更新为违约")
-            else:
-                self.logger.error(f"违约申请 {app_id} 创建失败，原因: {msg}")
+            results = []
+            valid = []
+            for index, (item, error) in enumerate(zip(items, field_errors)):
+                if error is None:
+                    if item['customer_id'] not in customers:
+                        error = f"客户 {item['customer_id']} 不存在"
+                    elif item['default_reason_id'] not in reasons:
+                        error = f"违约原因 {item['default_reason_id']} 不存在"
+                results.append({'index': index, 'id': None, 'success': error is None, 'message': error})
+                if error is None:
+                    valid.append(index)
             
-            return success
+            # 在进入工作单元之前一次预留整段申请ID：预留需要借用一个连接
+            sequences = self.get_next_sequences("DEF", len(valid)) if valid else []
             
+            with unit_of_work() as uow:
+                # 申请人不存在时创建默认用户（与单条创建一致）
+                for applicant_id in dict.fromkeys(items[i]['applicant_id'] for i in valid):
+                    if applicant_id in users:
+                        continue
+                    self.logger.warning(f"申请人 {applicant_id} 不存在，正在创建默认用户")
+                    if not self.create_default_user(applicant_id):
+                        uow.set_rollback_only()
+                        return False, f"无法创建默认用户 {applicant_id}"
+                
+                if valid:
+                    apply_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    applications = []
+                    for index, sequence in zip(valid, sequences):
+                        item = items[index]
+                        applications.append(DefaultApplication(
+                            app_id=self.generate_id("DEF", sequence),
+                            customer_id=item['customer_id'],
+                            default_reason_id=item['default_reason_id'],
+                            severity_level=item['severity_level'],
+                            applicant_id=item['applicant_id'],
+                            apply_time=apply_time,
+                            audit_status="待审核",
+                            remarks=item.get('remarks'),
+                            attachment_url=item.get('attachment_url')
+                        ))
+                    
+                    success, msg = DefaultApplicationDAO.create_many(applications)
+                    if not success:
+                        uow.set_rollback_only()
+                        self.logger.error(f"批量创建违约申请失败，原因: {msg}")
+                        return False, "批量写入违约申请失败"
+                    
+                    # 相关客户一次更新为违约（与申请写入同一事务）
+                    customer_ids = [application.customer_id for application in applications]
+                    if not CustomerDAO.update_default_status_many(customer_ids, 1):
+                        uow.set_rollback_only()
+                        return False, "更新客户违约状态失败"
+                    
+                    for index, application in zip(valid, applications):
+                        results[index]['id'] = application.app_id
+                        results[index]['message'] = '违约申请创建成功'
+                
+                self.logger.info(f"批量创建违约申请: 成功 {len(valid)}/{len(items)} 条")
+                return True, results
+                
         except Exception as e:
-            self.logger.error(f"创建违约申请失败: {str(e)}")
-            return False
+            self.logger.error(f"批量创建违约申请失败: {str(e)}")
+            return False, str(e)
     
-    def get_default_applications(self, customer_id=None, status=None, start_date=None, end_date=None):
-        """获取违约申请列表，支持筛选"""
+    def get_default_applications(self, customer_id=None, status=None, start_date=None, end_date=None,
+                                 limit=None, cursor=None, as_rows=False):
+        """获取违约申请列表，支持筛选和键集分页；as_rows 为 True 时返回行字典"""
         try:
-            if customer_id:
-                # 获取指定客户的违约申请
-                apps = DefaultApplicationDAO.list_with_filters(
-                    customer_name=None,  # 这里用customer_id筛选
-                    status=status,
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                # 过滤指定客户
-                apps = [app for app in apps if app.customer_id == customer_id]
-            else:
-                apps = DefaultApplicationDAO.list_with_filters(
-                    customer_name=None,
-                    status=status,
-                    start_date=start_date,
-                    end_date=end_date
-                )
+            apps = DefaultApplicationDAO.list_with_filters(
+                customer_id=customer_id,
+                status=status,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit,
+                cursor=cursor,
+                as_rows=as_rows
+            )
             return apps
         except Exception as e:
             self.logger.error(f"获取违约申请列表失败: {str(e)}")
@@ -108,34 +214,45 @@ class ApplicationService(BaseService):
             self.logger.error(f"获取违约申请详情失败: {str(e)}")
             return None
     
-    def audit_default_application(self, app_id, auditor_id, audit_status, audit_remarks=None):
-        """审核违约认定申请"""
+    def audit_default_application(self, app_id, auditor_id, audit_status, audit_remarks=None, version=None):
+        """
+        审核违约认定申请（乐观锁：申请在读取后被他人审核时不更新）
+        :param version: 客户端看到的申请版本号，None 表示以本次读取的版本为准
+        :raises ConflictError: 申请已被其他审核人领取或修改
+        """
         try:
-            # 验证申请是否存在
-            application = DefaultApplicationDAO.get_by_id(app_id)
-            if not application:
-                return False, f"申请 {app_id} 不存在"
+            with unit_of_work() as uow:
+                # 验证申请是否存在
+                application = DefaultApplicationDAO.get_by_id(app_id)
+                if not application:
+                    return False, f"申请 {app_id} 不存在"
                 
-            # 验证审核人是否存在
-            auditor = UserDAO.get_by_id(auditor_id)
-            if not auditor:
-                return False, f"审核人 {auditor_id} 不存在"
+                # 验证审核人是否存在
+                auditor = UserDAO.get_by_id(auditor_id)
+                if not auditor:
+                    return False, f"审核人 {auditor_id} 不存在"
                 
-            # 验证审核状态是否合法
-            if audit_status not in ["同意", "拒绝"]:
-                return False, "审核状态必须是'同意'或'拒绝'"
+                # 验证审核状态是否合法
+                if audit_status not in ["同意", "拒绝"]:
+                    return False, "审核状态必须是'同意'或'拒绝'"
                 
-            # 更新审核状态
-            success = DefaultApplicationDAO.update_audit_status(
-                app_id, auditor_id, audit_status, audit_remarks
-            )
-            
-            if success and audit_status == "同意":
-                # 如果审核通过，更新客户违约状态
-                CustomerDAO.update_default_status(application.customer_id, 1)
+                expected_version = self._expected_version(f"申请 {app_id}", application, version)
                 
-            return success, None if success else "更新审核状态失败"
-            
+                # 更新审核状态（被其他审核人领取且租约未过期，或版本号已变化时不更新）
+                success, msg = DefaultApplicationDAO.update_audit_status(
+                    app_id, auditor_id, audit_status, audit_remarks, expected_version
+                )
+                
+                if success and audit_status == "同意":
+                    # 如果审核通过，更新客户违约状态（与审核结果同一事务）
+                    if not CustomerDAO.update_default_status(application.customer_id, 1):
+                        uow.set_rollback_only()
+                        return False, "更新客户违约状态失败"
+                
+                return success, None if success else (msg or "更新审核状态失败")
+                
+        except ConflictError:
+            raise
         except Exception as e:
             self.logger.error(f"审核违约申请失败: {str(e)}")
             return False, str(e)
@@ -144,120 +261,259 @@ class ApplicationService(BaseService):
                                    recovery_reason_id, applicant_id):
         """创建重生申请"""
         try:
-            # 验证客户是否存在
-            customer = CustomerDAO.get_by_id(customer_id)
-            if not customer:
-                self.logger.error(f"创建重生申请失败：客户 {customer_id} 不存在")
-                return False
-                
-            # 验证原违约申请是否存在
-            # 若未指定原违约申请ID，则按客户查找最新一条
-            original_app = None
-            if original_default_app_id and original_default_app_id.strip():
-                original_app = DefaultApplicationDAO.get_by_id(original_default_app_id)
-                if not original_app:
-                    self.logger.error(f"创建重生申请失败：指定的原违约申请 {original_default_app_id} 不存在")
-                    return False
-            else:
-                # 查找客户最新的违约申请
-                original_app = DefaultApplicationDAO.get_latest_by_customer(customer_id)
-                if not original_app:
-                    self.logger.error(f"创建重生申请失败：未找到客户 {customer_id} 的原违约申请")
+            # 在进入工作单元之前生成申请ID（同 create_default_application）
+            recovery_app_id = self.generate_id("REC", self.get_next_sequence("REC"))
+            with unit_of_work():
+                # 验证客户是否存在
+                customer = CustomerDAO.get_by_id(customer_id)
+                if not customer:
+                    self.logger.error(f"创建重生申请失败：客户 {customer_id} 不存在")
                     return False
+                
+                # 验证原违约申请是否存在
+                # 若未指定原违约申请ID，则按客户查找最新一条
+                original_app = None
+                if original_default_app_id and original_default_app_id.strip():
+                    original_app = DefaultApplicationDAO.get_by_id(original_default_app_id)
+                    if not original_app:
+                        self.logger.error(f"创建重生申请失败：指定的原违约申请 {original_default_app_id} 不存在")
+                        return False
                 else:
-                    self.logger.info(f"自动匹配到客户 {customer_id} 的原违约申请: {original_app.app_id}")
-            
-            # 验证原违约申请必须是已审核通过的
-            if original_app.audit_status != "同意":
-                self.logger.error(f"创建重生申请失败：原违约申请 {original_app.app_id} 状态为 {original_app.audit_status}，必须是已审核通过")
-                return False
-                
-            # 验证重生原因是否存在
-            reason = RecoveryReasonDAO.get_by_id(recovery_reason_id)
-            if not reason:
-                self.logger.error(f"创建重生申请失败：重生原因 {recovery_reason_id} 不存在")
-                return False
-                
-            # 验证申请人是否存在，如果不存在则创建默认用户
-            user = UserDAO.get_by_id(applicant_id)
-            if not user:
-                self.logger.warning(f"申请人 {applicant_id} 不存在，正在创建默认用户")
-                # 创建默认用户
-                success = self.create_default_user(applicant_id)
-                if not success:
-                    self.logger.error(f"创建重生申请失败：无法创建默认用户 {applicant_id}")
+                    # 查找客户最新的违约申请
+                    original_app = DefaultApplicationDAO.get_latest_by_customer(customer_id)
+                    if not original_app:
+                        self.logger.error(f"创建重生申请失败：未找到客户 {customer_id} 的原违约申请")
+                        return False
+                    else:
+                        self.logger.info(f"自动匹配到客户 {customer_id} 的原违约申请: {original_app.app_id}")
+                
+                # 验证原违约申请必须是已审核通过的
+                if original_app.audit_status != "同意":
+                    self.logger.error(f"创建重生申请失败：原违约申请 {original_app.app_id} 状态为 {original_app.audit_status}，必须是已审核通过")
                     return False
-                self.logger.info(f"默认用户 {applicant_id} 创建成功")
                 
-            # 生成申请ID
-            sequence = self.get_next_sequence(
-                "t_recovery_application", "recovery_app_id", "REC"
-            )
-            recovery_app_id = self.generate_id("REC", sequence)
-            
-            # 决定使用的原违约申请ID（若未传入，则使用自动匹配到的ID）
-            chosen_original_default_app_id = (
-                original_default_app_id if original_default_app_id and original_default_app_id.strip() else original_app.app_id
-            )
-            self.logger.debug(
-                f"用于创建重生申请的原违约申请ID: {chosen_original_default_app_id}"
-            )
+                # 验证重生原因是否存在
+                reason = RecoveryReasonDAO.get_by_id(recovery_reason_id)
+                if not reason:
+                    self.logger.error(f"创建重生申请失败：重生原因 {recovery_reason_id} 不存在")
+                    return False
+                
+                # 验证申请人是否存在，如果不存在则创建默认用户
+                user = UserDAO.get_by_id(applicant_id)
+                if not user:
+                    self.logger.warning(f"申请人 {applicant_id} 不存在，正在创建默认用户")
+                    # 创建默认用户
+                    success = self.create_default_user(applicant_id)
+                    if not success:
+                        self.logger.error(f"创建重生申请失败：无法创建默认用户 {applicant_id}")
+                        return False
+                    self.logger.info(f"默认用户 {applicant_id} 创建成功")
+                
+                # 决定使用的原违约申请ID（若未传入，则使用自动匹配到的ID）
+                chosen_original_default_app_id = (
+                    original_default_app_id if original_default_app_id and original_default_app_id.strip() else original_app.app_id
+                )
+                self.logger.debug(
+                    f"用于创建重生申请的原违约申请ID: {chosen_original_default_app_id}"
+                )
 
-            # 创建申请对象
-            application = RecoveryApplication(
-                recovery_app_id=recovery_app_id,
-                customer_id=customer_id,
-                original_default_app_id=chosen_original_default_app_id,
-                recovery_reason_id=recovery_reason_id,
-                applicant_id=applicant_id,
-                apply_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                audit_status="待审核"
-            )
-            # 调试：输出申请对象的完整内容
-            self.logger.debug(f"创建重生申请对象: {application.to_dict()}")
-            
-            # 保存到数据库
-            success, msg = RecoveryApplicationDAO.create(application)
-            if not success:
-                self.logger.error(f"重生申请 {recovery_app_id} 创建失败，原因: {msg}")
-            return success
-            
+                # 创建申请对象
+                application = RecoveryApplication(
+                    recovery_app_id=recovery_app_id,
+                    customer_id=customer_id,
+                    original_default_app_id=chosen_original_default_app_id,
+                    recovery_reason_id=recovery_reason_id,
+                    applicant_id=applicant_id,
+                    apply_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    audit_status="待审核"
+                )
+                # 调试：输出申请对象的完整内容
+                self.logger.debug(f"创建重生申请对象: {application.to_dict()}")
+                
+                # 保存到数据库
+                success, msg = RecoveryApplicationDAO.create(application)
+                if not success:
+                    self.logger.error(f"重生申请 {recovery_app_id} 创建失败，原因: {msg}")
+                return success
+                
         except Exception as e:
             self.logger.error(f"创建重生申请失败: {str(e)}")
             return False
     
-    def audit_recovery_application(self, recovery_app_id, auditor_id, audit_status, audit_remarks=None):
-        """审核重生申请"""
+    def audit_recovery_application(self, recovery_app_id, auditor_id, audit_status, audit_remarks=None, version=None):
+        """
+        审核重生申请（乐观锁，同 audit_default_application）
+        :param version: 客户端看到的申请版本号，None 表示以本次读取的版本为准
+        :raises ConflictError: 申请已被其他审核人修改
+        """
         try:
-            # 验证申请是否存在
-            application = RecoveryApplicationDAO.get_by_id(recovery_app_id)
-            if not application:
-                return False, f"重生申请 {recovery_app_id} 不存在"
+            with unit_of_work() as uow:
+                # 验证申请是否存在
+                application = RecoveryApplicationDAO.get_by_id(recovery_app_id)
+                if not application:
+                    return False, f"重生申请 {recovery_app_id} 不存在"
                 
-            # 验证审核人是否存在
-            auditor = UserDAO.get_by_id(auditor_id)
-            if not auditor:
-                return False, f"审核人 {auditor_id} 不存在"
+                # 验证审核人是否存在
+                auditor = UserDAO.get_by_id(auditor_id)
+                if not auditor:
+                    return False, f"审核人 {auditor_id} 不存在"
                 
-            # 验证审核状态是否合法
-            if audit_status not in ["同意", "拒绝"]:
-                return False, "审核状态必须是'同意'或'拒绝'"
+                # 验证审核状态是否合法
+                if audit_status not in ["同意", "拒绝"]:
+                    return False, "审核状态必须是'同意'或'拒绝'"
                 
-            # 更新审核状态
-            success = RecoveryApplicationDAO.update_audit_status(
-                recovery_app_id, auditor_id, audit_status, audit_remarks
-            )
-            
-            if success and audit_status == "同意":
-                # 如果审核通过，更新客户违约状态
-                CustomerDAO.update_default_status(application.customer_id, 0)
+                expected_version = self._expected_version(f"重生申请 {recovery_app_id}", application, version)
                 
-            return success, None if success else "更新审核状态失败"
-            
+                # 更新审核状态（版本号已变化时不更新）
+                success, msg = RecoveryApplicationDAO.update_audit_status(
+                    recovery_app_id, auditor_id, audit_status, audit_remarks, expected_version
+                )
+                
+                if success and audit_status == "同意":
+                    # 如果审核通过，更新客户违约状态（与审核结果同一事务）
+                    if not CustomerDAO.update_default_status(application.customer_id, 0):
+                        uow.set_rollback_only()
+                        return False, "更新客户违约状态失败"
+                
+                return success, None if success else (msg or "更新审核状态失败")
+                
+        except ConflictError:
+            raise
         except Exception as e:
             self.logger.error(f"审核重生申请失败: {str(e)}")
             return False, str(e)
     
+    def audit_default_applications(self, app_ids, auditor_id, audit_status, audit_remarks=None):
+        """
+        批量审核违约认定申请：一次查询校验全部申请，一条 UPDATE ... IN 更新审核状态，
+        审核通过时一条语句更新相关客户违约状态，整体一次提交
+        :return: (success, 逐条结果列表 或 错误信息)
+        """
+        return self._audit_batch(
+            "违约申请", DefaultApplicationDAO, app_ids, auditor_id, audit_status, audit_remarks, 1
+        )
+    
+    def audit_recovery_applications(self, recovery_app_ids, auditor_id, audit_status, audit_remarks=None):
+        """批量审核重生申请（审核通过时恢复客户为非违约），返回值同 audit_default_applications"""
+        return self._audit_batch(
+            "重生申请", RecoveryApplicationDAO, recovery_app_ids, auditor_id, audit_status, audit_remarks, 0
+        )
+    
+    def _audit_batch(self, label, dao, app_ids, auditor_id, audit_status, audit_remarks, is_default):
+        """
+        :param dao: 申请 DAO（提供 get_many、update_audit_status_many）
+        :param is_default: 审核通过时客户的违约状态
+        :raises ConflictError: 校验之后、更新之前有申请被其他审核人修改、审核或领取（整体不更新，ids 为这些申请ID）
+        """
+        try:
+            with unit_of_work() as uow:
+                # 验证审核人是否存在
+                auditor = UserDAO.get_by_id(auditor_id)
+                if not auditor:
+                    return False, f"审核人 {auditor_id} 不存在"
+                
+                # 验证审核状态是否合法
+                if audit_status not in ["同意", "拒绝"]:
+                    return False, "审核状态必须是'同意'或'拒绝'"
+                
+                # 一次查询验证全部申请是否存在、是否仍待审核、是否被其他审核人领取
+                app_ids = list(dict.fromkeys(app_ids))
+                applications = dao.get_many(app_ids)
+                now = datetime.now()
+                errors = {}
+                for app_id in app_ids:
+                    application = applications.get(app_id)
+                    if application is None:
+                        errors[app_id] = f"{label} {app_id} 不存在"
+                    elif application.audit_status != "待审核":
+                        # 已审核的申请不再重复审核，避免再次改写客户违约状态
+                        errors[app_id] = f"{label} {app_id} 已审核（{application.audit_status}），不能重复审核"
+                    elif self._claimed_by_other(application, auditor_id, now):
+                        errors[app_id] = f"{label} {app_id} 已被 {application.claimed_by} 领取"
+                found = [app_id for app_id in app_ids if app_id not in errors]
+                
+                if found:
+                    # 更新审核状态
+                    # 按读取时的版本号条件更新，校验之后被修改、审核或领取的申请整体不更新
+                    versions = {app_id: applications[app_id].version for app_id in found}
+                    success, msg = dao.update_audit_status_many(versions, auditor_id, audit_status, audit_remarks)
+                    if not success:
+                        uow.set_rollback_only()
+                        return False, msg or "更新审核状态失败"
+                    
+                    if audit_status == "同意":
+                        # 如果审核通过，更新客户违约状态（与审核结果同一事务）
+                        customer_ids = [applications[app_id].customer_id for app_id in found]
+                        if not CustomerDAO.update_default_status_many(customer_ids, is_default):
+                            uow.set_rollback_only()
+                            return False, "更新客户违约状态失败"
+                
+                results = [
+                    {'id': app_id, 'success': False, 'message': errors[app_id]} if app_id in errors
+                    else {'id': app_id, 'success': True, 'message': '审核成功'}
+                    for app_id in app_ids
+                ]
+                self.logger.info(f"批量审核{label}: 审核人 {auditor_id}, {audit_status} {len(found)}/{len(app_ids)} 条")
+                return True, results
+                
+        except ConflictError:
+            raise
+        except Exception as e:
+            self.logger.error(f"批量审核{label}失败: {str(e)}")
+            return False, str(e)
+    
+    @staticmethod
+    def _expected_version(label, application, version):
+        """
+        确定审核更新时校验的版本号：客户端传入的版本号优先，否则使用本次读取的版本号
+        :raises ConflictError: 客户端版本号与当前版本不一致
+        """
+        if version is None:
+            return application.version
+        if application.version is not None and version != application.version:
+            raise ConflictError(f"{label} 已被其他审核人修改（当前版本 {application.version}），请刷新后重试")
+        return version
+    
+    @staticmethod
+    def _claimed_by_other(application, auditor_id, now):
+        """
+        申请是否被其他审核人领取且租约未过期（重生申请没有领取，视为未领取）
+        只用于逐条给出原因；更新语句中的可领取条件才是最终依据
+        """
+        return isinstance(application, DefaultApplication) and application.is_claimed_by_other(auditor_id, now)
+    
+    def claim_default_applications(self, auditor_id, limit):
+        """
+        审核人领取一批待审核的违约申请（互不重复，租约到期前其他审核人不能审核）
+        :return: (success, 审核列表行 或 错误信息)
+        """
+        try:
+            auditor = UserDAO.get_by_id(auditor_id)
+            if not auditor:
+                return False, f"审核人 {auditor_id} 不存在"
+            app_ids = DefaultApplicationDAO.claim_pending(auditor_id, limit, CLAIM_CONFIG['lease_seconds'])
+            if app_ids is None:
+                return False, "领取申请失败"
+            self.logger.info(f"审核人 {auditor_id} 领取违约申请 {len(app_ids)} 条")
+            return True, DefaultApplicationDAO.get_reviews(app_ids)
+        except Exception as e:
+            self.logger.error(f"领取违约申请失败: {str(e)}")
+            return False, str(e)
+    
+    def release_default_applications(self, auditor_id, app_ids=None):
+        """
+        释放审核人领取的违约申请
+        :return: (success, 释放数量 或 错误信息)
+        """
+        try:
+            count = DefaultApplicationDAO.release_claims(auditor_id, app_ids)
+            if count is None:
+                return False, "释放申请失败"
+            return True, count
+        except Exception as e:
+            self.logger.error(f"释放违约申请失败: {str(e)}")
+            return False, str(e)
+    
     def create_default_user(self, user_id):
         """创建默认用户"""
         try:
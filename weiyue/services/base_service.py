@@ -19,22 +19,15 @@ class BaseService:
         """生成带前缀的ID"""
         return f"{prefix}{str(sequence).zfill(3)}"
         
-    def get_next_sequence(self, table_name, id_column, prefix):
-        """获取下一个序号"""
-        from db.base import Database
-        db = Database()
-        try:
-            # 以数字方式获取前缀后的最大序号，避免字符串比较导致顺序错误
-            prefix_len = len(prefix)
-            sql = (
-                f"SELECT COALESCE(MAX(CAST(SUBSTRING({id_column}, %s) AS UNSIGNED)), 0) AS max_seq "
-                f"FROM {table_name} WHERE {id_column} LIKE %s"
-            )
-            success, msg = db.execute(sql, (prefix_len + 1, f"{prefix}%"))
-            if success:
-                row = db.fetchone()
-                max_seq = row['max_seq'] if row and 'max_seq' in row else 0
-                return int(max_seq) + 1
-            return 1
-        finally:
-            db.close()
+    def get_next_sequence(self, prefix):
+        """
+        获取下一个序号（由序列表按号段分配，O(1) 且多进程不冲突）
+        号段用完时会借用一个连接预留新号段，须在进入工作单元之前调用
+        """
+        from db.sequence import get_allocator
+        return get_allocator().next_value(prefix)
+        
+    def get_next_sequences(self, prefix, count):
+        """一次获取 count 个连续序号（批量创建时使用），返回序号范围；同样须在进入工作单元之前调用"""
+        from db.sequence import get_allocator
+        return get_allocator().next_block(prefix, count)
@@ -0,0 +1,147 @@
+import threading
+import time
+from bisect import bisect_left
+from heapq import merge
+
+from dao.CustomerDAO import CustomerDAO
+from .base_service import BaseService
+from config import SUGGEST_CONFIG
+
+
+class CustomerSuggestService(BaseService):
+    """
+    客户联想搜索服务：进程内维护按客户ID、客户名称排序的前缀索引，
+    首次使用时全量加载，之后按 update_time/create_time 增量刷新。
+
+    索引是不可变快照 (customers, keys)：刷新在后台线程中构建新快照后整体替换引用，
+    查询只读取当前快照，不加锁也不等待刷新（仅首次加载时最多等待 initial_load_timeout 秒）。
+    增量刷新只能看到新增和修改的客户，已删除的客户要到下一次全量重建（full_refresh_interval）才从索引中去掉。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._refresh_lock = threading.Lock()   # 同一时间只运行一个刷新任务
+        self._loaded = threading.Event()        # 首次全量加载完成
+        # customers: str(customer_id) -> {'customer_id', 'customer_name', 'is_default'}
+        # keys: 有序列表 [(小写检索键, str(customer_id))]，包含ID和名称两类检索键
+        self._snapshot = ({}, [])
+        self._watermark = None   # 已同步到的最大 update_time/create_time（只由刷新线程读写）
+        self._loaded_at = 0.0
+        self._refreshed_at = 0.0
+
+    @staticmethod
+    def _index_keys(customer):
+        """一个客户对应的检索键（客户ID、客户名称）"""
+        keys = {str(customer['customer_id']).lower()}
+        if customer['customer_name']:
+            keys.add(customer['customer_name'].lower())
+        return keys
+
+    @staticmethod
+    def _customer(row):
+        return {
+            'customer_id': row['customer_id'],
+            'customer_name': row['customer_name'],
+            'is_default': row['is_default']
+        }
+
+    @staticmethod
+    def _advance(watermark, row):
+        """推进同步水位线"""
+        for value in (row['update_time'], row['create_time']):
+            if value and (watermark is None or value > watermark):
+                watermark = value
+        return watermark
+
+    def _full_load(self):
+        """全量重建索引（调用方需持有刷新锁）"""
+        rows = CustomerDAO.list_search_fields()
+        if rows is None:
+            return
+        customers = {}
+        keys = []
+        watermark = None
+        for row in rows:
+            customer = self._customer(row)
+            customer_id = str(row['customer_id'])
+            customers[customer_id] = customer
+            keys.extend((key, customer_id) for key in self._index_keys(customer))
+            watermark = self._advance(watermark, row)
+        keys.sort()
+        self._snapshot = (customers, keys)
+        self._watermark = watermark
+        self._loaded_at = self._refreshed_at = time.monotonic()
+        self._loaded.set()
+        self.logger.info(f"客户联想索引全量加载完成，共 {len(customers)} 个客户")
+
+    def _incremental_refresh(self):
+        """按水位线增量同步新增和修改的客户（调用方需持有刷新锁）"""
+        rows = CustomerDAO.list_search_fields(changed_since=self._watermark)
+        if rows is None:
+            return
+        if rows:
+            changed = {}
+            watermark = self._watermark
+            for row in rows:
+                changed[str(row['customer_id'])] = self._customer(row)
+                watermark = self._advance(watermark, row)
+            customers, keys = self._snapshot
+            customers = {**customers, **changed}
+            # 变更的客户单独排序后与其余检索键归并一次，整体 O(n + k log k)
+            added = sorted((key, customer_id) for customer_id, customer in changed.items()
+                           for key in self._index_keys(customer))
+            kept = [entry for entry in keys if entry[1] not in changed]
+            self._snapshot = (customers, list(merge(kept, added)))
+            self._watermark = watermark
+        self._refreshed_at = time.monotonic()
+
+    def _refresh(self):
+        """后台刷新任务，结束时释放刷新锁"""
+        try:
+            if not self._loaded_at or time.monotonic() - self._loaded_at > SUGGEST_CONFIG['full_refresh_interval']:
+                self._full_load()
+            else:
+                self._incremental_refresh()
+        except Exception as e:
+            self.logger.error(f"客户联想索引刷新失败: {str(e)}")
+        finally:
+            self._refresh_lock.release()
+
+    def _ensure_fresh(self):
+        """索引到期时在后台线程刷新；尚未加载过时等待首次加载"""
+        now = time.monotonic()
+        due = (not self._loaded_at
+               or now - self._loaded_at > SUGGEST_CONFIG['full_refresh_interval']
+               or now - self._refreshed_at > SUGGEST_CONFIG['refresh_interval'])
+        if due and self._refresh_lock.acquire(blocking=False):
+            threading.Thread(target=self._refresh, name='customer-suggest-refresh', daemon=True).start()
+        if not self._loaded.is_set():
+            self._loaded.wait(SUGGEST_CONFIG['initial_load_timeout'])
+
+    def suggest(self, query, limit=None):
+        """
+        按客户ID或客户名称前缀联想
+        :param query: 输入的前缀，不区分大小写
+        :param limit: 最多返回条数
+        :return: 客户字典列表（customer_id、customer_name、is_default），不超过 limit 条
+        """
+        limit = limit or SUGGEST_CONFIG['default_limit']
+        prefix = (query or '').strip().lower()
+        try:
+            self._ensure_fresh()
+            customers, keys = self._snapshot
+            result = []
+            seen = set()
+            i = bisect_left(keys, (prefix, ''))
+            while i < len(keys) and len(result) < limit:
+                key, customer_id = keys[i]
+                if not key.startswith(prefix):
+                    break
+                if customer_id not in seen:
+                    seen.add(customer_id)
+                    result.append(dict(customers[customer_id]))
+                i += 1
+            return result
+        except Exception as e:
+            self.logger.error(f"客户联想搜索失败: {str(e)}")
+            return []
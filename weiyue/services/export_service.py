@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+import time
+from itertools import islice
+
+from dao.DefaultApplicationDAO import DefaultApplicationDAO
+from dao.RecoveryApplicationDAO import RecoveryApplicationDAO
+from db.base import FETCH_BATCH_SIZE
+from .base_service import BaseService
+
+# 导出格式 -> 响应类型
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson'
+}
+
+# 违约申请导出列（查询结果列名，同时作为 CSV 表头和 JSONL 字段名）
+DEFAULT_APPLICATION_COLUMNS = [
+    'app_id', 'customer_id', 'customer_name', 'default_reason_id', 'reason_content',
+    'severity_level', 'remarks', 'attachment_url', 'applicant_id', 'applicant_name',
+    'apply_time', 'audit_status', 'auditor_id', 'auditor_name', 'audit_time', 'audit_remarks'
+]
+
+# 重生申请导出列
+RECOVERY_APPLICATION_COLUMNS = [
+    'recovery_app_id', 'customer_id', 'customer_name', 'current_external_rating',
+    'original_default_app_id', 'original_severity_level', 'original_reason_id', 'original_reason_content',
+    'recovery_reason_id', 'recovery_content', 'applicant_id', 'apply_time',
+    'audit_status', 'auditor_id', 'auditor_name', 'audit_time', 'audit_remarks'
+]
+
+
+class ExportService(BaseService):
+    """
+    申请数据导出服务：服务端游标逐批读取关联查询结果，边读边编码为 CSV / JSONL，
+    内存占用与导出行数无关；导出结束时记录行数和吞吐量（行/秒）
+    """
+
+    def export_default_applications(self, fmt, **filters):
+        """
+        导出违约申请（筛选条件与 DefaultApplicationDAO.list_with_filters 相同，customer_id 可为客户ID列表）
+        :return: 逐块产出文本的生成器
+        :raises ValueError: 导出格式不支持
+        :raises RuntimeError: 查询失败
+        """
+        return self._export(
+            "违约申请", fmt, DEFAULT_APPLICATION_COLUMNS, DefaultApplicationDAO.iter_enriched(**filters)
+        )
+
+    def export_recovery_applications(self, fmt, **filters):
+        """导出重生申请（筛选条件与 RecoveryApplicationDAO.list_with_filters 相同，customer_id 可为客户ID列表），返回值同上"""
+        return self._export(
+            "重生申请", fmt, RECOVERY_APPLICATION_COLUMNS, RecoveryApplicationDAO.iter_enriched(**filters)
+        )
+
+    def _export(self, name, fmt, columns, rows):
+        if fmt not in EXPORT_FORMATS:
+            rows.close()
+            raise ValueError(f"不支持的导出格式: {fmt}，可选 {', '.join(EXPORT_FORMATS)}")
+        batches = iter(lambda: list(islice(rows, FETCH_BATCH_SIZE)), [])
+        start = time.perf_counter()
+        try:
+            # 先读取第一批：查询失败时由调用方返回错误，而不是输出半个文件
+            first = next(batches, None)
+        except Exception:
+            rows.close()
+            raise
+        encode = self._encode_csv if fmt == 'csv' else self._encode_jsonl
+        return self._stream(name, columns, rows, batches, first, encode, start)
+
+    def _stream(self, name, columns, rows, batches, first, encode, start):
+        count = 0
+        completed = False
+        try:
+            if encode == self._encode_csv:
+                # 带 BOM，Excel 打开时能正确识别 UTF-8 中文
+                yield '\ufeff' + self._csv_lines([columns])
+            batch = first
+            while batch:
+                yield encode(columns, batch)
+                count += len(batch)
+                batch = next(batches, None)
+            completed = True
+        finally:
+            rows.close()
+            elapsed = time.perf_counter() - start
+            rate = count / elapsed if elapsed > 0 else 0
+            status = "完成" if completed else "中断"
+            self.logger.info(f"导出{name}{status}: {count} 行, 用时 {elapsed:.2f} 秒, {rate:.0f} 行/秒")
+
+    @staticmethod
+    def _csv_lines(records):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(records)
+        return buffer.getvalue()
+
+    def _encode_csv(self, columns, batch):
+        return self._csv_lines([row.get(column) for column in columns] for row in batch)
+
+    @staticmethod
+    def _encode_jsonl(columns, batch):
+        return ''.join(
+            json.dumps({column: row.get(column) for column in columns}, ensure_ascii=False, default=str) + '\n'
+            for row in batch
+        )
@@ -0,0 +1,133 @@
+"""
+客户信息批量导入
+
+逐行读取 CSV（表头须包含 customer_id、customer_name，可选 current_external_rating、industry_type、region），
+按批与库中数据比对，只写入新增或有变化的客户。
+用法（在 weiyue 目录下）：
+    python -m services.import_service customers.csv [--chunk-size 1000]
+"""
+import csv
+import sys
+import time
+from itertools import islice
+
+from dao.CustomerDAO import CustomerDAO, IMPORT_COLUMNS
+from config import IMPORT_CONFIG
+from .base_service import BaseService
+
+# 最多记录的错误行数
+MAX_ERRORS = 100
+
+
+class CustomerImportService(BaseService):
+    """客户信息批量导入服务"""
+
+    def import_csv(self, stream, chunk_size=None):
+        """
+        导入客户 CSV
+        :param stream: 文本流（CSV 内容）
+        :param chunk_size: 每批比对、写入的行数，默认取 IMPORT_CONFIG
+        :return: 导入统计（读取、新增、更新、未变化、无效行数，耗时与每秒行数，错误示例）
+        :raises ValueError: 表头缺少必需的列
+        :raises RuntimeError: 查询或写入失败（已提交的批次不回滚）
+        """
+        chunk_size = chunk_size or IMPORT_CONFIG['chunk_size']
+        reader = csv.DictReader(stream)
+        header = [name.strip() for name in reader.fieldnames or []]
+        for required in ('customer_id', 'customer_name'):
+            if required not in header:
+                raise ValueError(f"CSV 表头缺少 {required} 列")
+        reader.fieldnames = header
+        # 只写入 CSV 中出现的字段，未提供的字段保持原值
+        columns = tuple(c for c in IMPORT_COLUMNS if c in header)
+
+        stats = {'read': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'invalid': 0, 'errors': []}
+        start = time.perf_counter()
+        # 表头占第 1 行，数据从第 2 行开始
+        lines = enumerate(reader, start=2)
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if not chunk:
+                break
+            stats['read'] += len(chunk)
+            self._import_chunk(chunk, columns, stats)
+
+        elapsed = time.perf_counter() - start
+        stats['elapsed'] = round(elapsed, 3)
+        stats['rows_per_second'] = round(stats['read'] / elapsed) if elapsed > 0 else 0
+        self.logger.info(
+            f"客户导入完成: 读取 {stats['read']} 行, 新增 {stats['inserted']}, 更新 {stats['updated']}, "
+            f"未变化 {stats['unchanged']}, 无效 {stats['invalid']}, "
+            f"用时 {elapsed:.2f} 秒, {stats['rows_per_second']} 行/秒"
+        )
+        return stats
+
+    def _import_chunk(self, chunk, columns, stats):
+        """比对并写入一批客户（一批一个事务）"""
+        customers = {}
+        for line, row in chunk:
+            customer, error = self._parse_row(row, columns)
+            if error:
+                stats['invalid'] += 1
+                if len(stats['errors']) < MAX_ERRORS:
+                    stats['errors'].append({'line': line, 'message': error})
+                continue
+            # 同一批中重复的客户以最后一行为准
+            customers[customer['customer_id']] = customer
+        if not customers:
+            return
+
+        existing = CustomerDAO.load_many(list(customers))
+        if existing is None:
+            raise RuntimeError("查询现有客户失败")
+        changed = []
+        inserted = 0
+        for customer_id, customer in customers.items():
+            current = existing.get(customer_id)
+            if current is None:
+                inserted += 1
+            elif all(current.get(c) == customer[c] for c in columns):
+                stats['unchanged'] += 1
+                continue
+            changed.append(customer)
+
+        success, msg = CustomerDAO.upsert_many(changed, columns)
+        if not success:
+            raise RuntimeError(f"写入客户失败: {msg}")
+        stats['inserted'] += inserted
+        stats['updated'] += len(changed) - inserted
+
+    @staticmethod
+    def _parse_row(row, columns):
+        """
+        :return: (客户字典, 错误信息)；空字符串视为 NULL
+        """
+        customer_id = (row.get('customer_id') or '').strip()
+        if not customer_id:
+            return None, "customer_id 为空"
+        customer = {'customer_id': customer_id}
+        for column in columns:
+            value = (row.get(column) or '').strip()
+            customer[column] = value or None
+        if not customer['customer_name']:
+            return None, "customer_name 为空"
+        return customer, None
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    chunk_size = None
+    if '--chunk-size' in args:
+        i = args.index('--chunk-size')
+        chunk_size = int(args[i + 1])
+        del args[i:i + 2]
+    if len(args) != 1:
+        print("用法: python -m services.import_service customers.csv [--chunk-size 1000]")
+        sys.exit(2)
+    # utf-8-sig 兼容 Excel 导出的带 BOM 文件
+    with open(args[0], encoding='utf-8-sig', newline='') as f:
+        result = CustomerImportService().import_csv(f, chunk_size)
+    errors = result.pop('errors')
+    print(result)
+    for error in errors:
+        print(f"第 {error['line']} 行: {error['message']}")
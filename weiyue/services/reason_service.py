@@ -7,8 +7,17 @@ from db.models import DefaultReason, RecoveryReason
 class ReasonService(BaseService):
     """违约和重生原因管理服务"""
     
-    def __init__(self):
-        self.db = Database()  # 初始化数据库连
+    def _update(self, table_name, update_data, condition_data):
+        """每次修改从连接池借出独立连接，避免多线程共享同一连接"""
+        db = Database()
+        try:
+            return db.update(
+                table_name=table_name,
+                update_data=update_data,
+                condition_data=condition_data
+            )
+        finally:
+            db.close()
     
     def update_default_reason(self, reason_id, update_data):
         """
@@ -26,11 +35,14 @@ class ReasonService(BaseService):
             return False, "启用状态只能是 0（禁用）或 1（启用）"
 
         # 2. 调用数据库更新方法（表名：t_default_reason，条件：reason_id）
-        return self.db.update(
+        result = self._update(
             table_name="t_default_reason",
             update_data=update_data,
             condition_data={"reason_id": reason_id}
         )
+        # 3. 提交后使缓存失效
+        DefaultReasonDAO.invalidate_cache()
+        return result
 
     # -------------------------- 重生原因修改 --------------------------
     def update_recovery_reason(self, reason_id, update_data):
@@ -44,12 +56,15 @@ class ReasonService(BaseService):
             return False, "启用状态只能是 0（禁用）或 1（启用）"
 
         # 2. 调用数据库更新方法（表名：t_recovery_reason）
-        return self.db.update(
+        result = self._update(
             table_name="t_recovery_reason",
             update_data=update_data,
             # 主键字段为 recovery_id，不是 reason_id
             condition_data={"recovery_id": reason_id}
         )
+        # 3. 提交后使缓存失效
+        RecoveryReasonDAO.invalidate_cache()
+        return result
 
     
     def get_all_enabled_default_reasons(self):
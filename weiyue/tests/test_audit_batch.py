@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+import services.application_service as application_service
+from dao.CustomerDAO import CustomerDAO
+from dao.UserDAO import UserDAO
+from db.base import ConflictError
+from db.models import DefaultApplication, row_mapper
+
+NOW = datetime.now()
+
+
+def make_application(app_id, audit_status='待审核', version=1):
+    return row_mapper(DefaultApplication)({
+        'app_id': app_id,
+        'customer_id': f'C-{app_id}',
+        'default_reason_id': 'R001',
+        'severity_level': 'high',
+        'applicant_id': 'U001',
+        'apply_time': NOW - timedelta(days=1),
+        'audit_status': audit_status,
+        'version': version,
+    })
+
+
+class FakeUnitOfWork:
+    rollback_only = False
+
+    def set_rollback_only(self):
+        self.rollback_only = True
+
+
+class FakeDAO:
+    """记录批量更新调用的申请 DAO"""
+
+    def __init__(self, applications):
+        self.applications = {a.app_id: a for a in applications}
+        self.updated = None
+
+    def get_many(self, app_ids):
+        return {app_id: self.applications[app_id] for app_id in app_ids if app_id in self.applications}
+
+    def update_audit_status_many(self, versions, auditor_id, audit_status, audit_remarks):
+        self.updated = versions
+        return True, None
+
+
+@pytest.fixture
+def service(monkeypatch):
+    @contextmanager
+    def unit_of_work():
+        yield FakeUnitOfWork()
+
+    updated_customers = []
+    monkeypatch.setattr(application_service, 'unit_of_work', unit_of_work)
+    monkeypatch.setattr(UserDAO, 'get_by_id', staticmethod(lambda user_id: object()))
+    monkeypatch.setattr(CustomerDAO, 'update_default_status_many',
+                        staticmethod(lambda ids, is_default: updated_customers.extend(ids) or True))
+    service = application_service.ApplicationService()
+    service.updated_customers = updated_customers
+    return service
+
+
+def test_decided_applications_are_rejected_per_item(service):
+    dao = FakeDAO([make_application('DEF001', version=3), make_application('DEF002', audit_status='同意')])
+    success, results = service._audit_batch(
+        '违约申请', dao, ['DEF001', 'DEF002', 'DEF003'], 'U002', '同意', '', 1
+    )
+    assert success
+    assert [r['success'] for r in results] == [True, False, False]
+    assert '不能重复审核' in results[1]['message']
+    assert '不存在' in results[2]['message']
+    # 已审核的申请既不更新审核状态，也不再改写客户违约状态
+    # 按读取时的版本号条件更新
+    assert dao.updated == {'DEF001': 3}
+    assert service.updated_customers == ['C-DEF001']
+
+
+def test_conflict_propagates(service):
+    class ConflictingDAO(FakeDAO):
+        def update_audit_status_many(self, versions, auditor_id, audit_status, audit_remarks):
+            raise ConflictError("冲突", ['DEF002'])
+
+    dao = ConflictingDAO([make_application('DEF001'), make_application('DEF002')])
+    with pytest.raises(ConflictError) as info:
+        service._audit_batch('违约申请', dao, ['DEF001', 'DEF002'], 'U002', '同意', '', 1)
+    assert info.value.ids == ['DEF002']
+    assert service.updated_customers == []
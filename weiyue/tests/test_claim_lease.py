@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+from db.models import DefaultApplication, row_mapper
+
+NOW = datetime(2024, 5, 1, 10, 0, 0)
+
+
+def make_application(claimed_by=None, claim_expires_at=None):
+    """按查询结果构造违约申请（与 DAO 一样经过 row_mapper，时间字段为字符串）"""
+    return row_mapper(DefaultApplication)({
+        'app_id': 'DEF001',
+        'customer_id': 'C001',
+        'default_reason_id': 'R001',
+        'severity_level': 'high',
+        'applicant_id': 'U001',
+        'apply_time': NOW - timedelta(days=1),
+        'audit_status': '待审核',
+        'claimed_by': claimed_by,
+        'claim_expires_at': claim_expires_at,
+    })
+
+
+def test_unclaimed_is_free():
+    assert not make_application().is_claimed_by_other('U002', NOW)
+
+
+def test_live_lease_of_other_auditor_blocks():
+    application = make_application('U003', NOW + timedelta(minutes=5))
+    assert isinstance(application.claim_expires_at, str)
+    assert application.is_claimed_by_other('U002', NOW)
+
+
+def test_own_lease_does_not_block():
+    assert not make_application('U002', NOW + timedelta(minutes=5)).is_claimed_by_other('U002', NOW)
+
+
+def test_expired_lease_does_not_block():
+    assert not make_application('U003', NOW - timedelta(seconds=1)).is_claimed_by_other('U002', NOW)
+
+
+def test_lease_expiring_now_still_blocks():
+    # 与 SQL 条件 claim_expires_at < NOW() 一致：到期时刻当秒仍视为有效
+    assert make_application('U003', NOW).is_claimed_by_other('U002', NOW)
+
+
+def test_datetime_expiry_is_accepted():
+    application = DefaultApplication(
+        'DEF001', 'C001', 'R001', 'high', 'U001', NOW, '待审核',
+        claimed_by='U003', claim_expires_at=NOW + timedelta(minutes=5)
+    )
+    assert application.is_claimed_by_other('U002', NOW)
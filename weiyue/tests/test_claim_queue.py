@@ -0,0 +1,61 @@
+import re
+
+import dao.DefaultApplicationDAO as default_application_dao
+from dao.DefaultApplicationDAO import DefaultApplicationDAO, _claim_query, _claim_update
+
+
+def normalize(sql):
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def test_claim_query_locks_oldest_claimable_pending():
+    sql, params = _claim_query('U002', 10)
+    sql = normalize(sql)
+    assert "WHERE audit_status = '待审核' AND (claimed_by IS NULL OR claimed_by = %s OR claim_expires_at < NOW())" in sql
+    # 按申请时间先后领取，多人同时领取时跳过已被锁定的行而不是等待
+    assert sql.endswith('ORDER BY apply_time, app_id LIMIT %s FOR UPDATE SKIP LOCKED')
+    assert sql.count('%s') == len(params)
+    assert params == ['U002', 10]
+
+
+def test_claim_update_sets_lease():
+    sql, params = _claim_update('U002', 600, ['DEF001', 'DEF002'])
+    sql = normalize(sql)
+    assert 'SET claimed_by = %s, claim_expires_at = NOW() + INTERVAL %s SECOND' in sql
+    assert sql.endswith('WHERE app_id IN (%s, %s)')
+    assert params == ['U002', 600, 'DEF001', 'DEF002']
+
+
+class FakeDatabase:
+    """不连接数据库：领取查询返回固定的申请ID，记录执行的语句"""
+    executed = []
+
+    def __init__(self, *args, **kwargs):
+        self.committed = False
+
+    def execute(self, sql, params=None):
+        FakeDatabase.executed.append((normalize(sql), list(params)))
+        return True, None
+
+    def fetchall(self):
+        return [{'app_id': 'DEF001'}, {'app_id': 'DEF002'}]
+
+    def commit(self):
+        FakeDatabase.executed.append(('COMMIT', []))
+
+    def rollback(self):
+        FakeDatabase.executed.append(('ROLLBACK', []))
+
+    def close(self):
+        pass
+
+
+def test_claim_pending_locks_then_sets_lease_in_one_transaction(monkeypatch):
+    FakeDatabase.executed = []
+    monkeypatch.setattr(default_application_dao, 'Database', FakeDatabase)
+    assert DefaultApplicationDAO.claim_pending('U002', 10, 600) == ['DEF001', 'DEF002']
+    statements = [sql for sql, params in FakeDatabase.executed]
+    assert statements[0].startswith('SELECT app_id FROM t_default_application')
+    assert statements[1].startswith('UPDATE t_default_application SET claimed_by')
+    assert statements[2] == 'COMMIT'
+    assert FakeDatabase.executed[1][1] == ['U002', 600, 'DEF001', 'DEF002']
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+import app as web
+from dao.CustomerDAO import CustomerDAO
+from db.models import CustomerInfo, row_mapper
+
+
+def make_customers(count):
+    return [row_mapper(CustomerInfo)({
+        'customer_id': f'C{i:03d}',
+        'customer_name': f'客户{i}',
+        'is_default': 1,
+        'create_time': f'2024-05-01 10:00:{i:02d}',
+        'update_time': f'2024-05-02 10:00:{i:02d}',
+    }) for i in range(count, 0, -1)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    customers = make_customers(3)
+    for name in ('list_all', 'list_defaulted'):
+        monkeypatch.setattr(CustomerDAO, name, staticmethod(lambda limit=None, cursor=None: customers[:limit]))
+    for name in ('iter_all', 'iter_defaulted'):
+        monkeypatch.setattr(CustomerDAO, name, staticmethod(lambda limit=None, cursor=None: (c for c in customers[:limit])))
+    return web.app.test_client()
+
+
+@pytest.mark.parametrize('path', ['/api/customers', '/api/customers/defaulted'])
+@pytest.mark.parametrize('query', ['', '?limit=2'])
+def test_stream_matches_page_response(client, path, query):
+    """流式输出与普通分页响应的内容、nextCursor 一致"""
+    page = client.get(path + query).get_json()
+    separator = '&' if query else '?'
+    streamed = json.loads(client.get(path + query + separator + 'stream=1').get_data(as_text=True))
+    assert streamed == page
+    assert len(page['data']) == (2 if query else 3)
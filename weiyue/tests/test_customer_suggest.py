@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+
+from dao.CustomerDAO import CustomerDAO
+from services.customer_suggest_service import CustomerSuggestService
+
+
+def make_row(customer_id, customer_name, minute):
+    return {
+        'customer_id': customer_id,
+        'customer_name': customer_name,
+        'is_default': 0,
+        'create_time': datetime(2024, 5, 1, 10, 0),
+        'update_time': datetime(2024, 5, 1, 10, minute),
+    }
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """索引由 list_search_fields 的结果构建：全量加载返回 tables["full"]，增量刷新返回 tables["changed"]"""
+    tables = {'full': [], 'changed': []}
+
+    def list_search_fields(changed_since=None):
+        return tables['changed'] if changed_since else tables['full']
+
+    monkeypatch.setattr(CustomerDAO, 'list_search_fields', staticmethod(list_search_fields))
+    service = CustomerSuggestService()
+    service.tables = tables
+    return service
+
+
+def test_full_load_builds_sorted_index(service):
+    service.tables['full'] = [make_row('C002', '张三', 1), make_row('C001', '李四', 2)]
+    service._full_load()
+    customers, keys = service._snapshot
+    assert keys == sorted(keys)
+    assert [c['customer_id'] for c in service.suggest('c')] == ['C001', 'C002']
+    assert service._watermark == datetime(2024, 5, 1, 10, 2)
+
+
+def test_incremental_refresh_replaces_changed_keys(service):
+    service.tables['full'] = [make_row('C001', '张三', 1), make_row('C002', '李四', 2)]
+    service._full_load()
+    before = service._snapshot
+    service.tables['changed'] = [make_row('C002', '王五', 3), make_row('C003', '张飞', 4)]
+    service._incremental_refresh()
+    customers, keys = service._snapshot
+    assert keys == sorted(keys)
+    assert ('李四', 'C002') not in keys
+    assert [c['customer_id'] for c in service.suggest('张')] == ['C001', 'C003']
+    assert [c['customer_name'] for c in service.suggest('王')] == ['王五']
+    # 刷新替换整个快照，不修改正在被查询读取的旧快照
+    assert ('李四', 'C002') in before[1]
+    assert service._watermark == datetime(2024, 5, 1, 10, 4)
@@ -0,0 +1,14 @@
+import pytest
+from pymysql.cursors import RE_INSERT_VALUES
+
+from dao.CustomerDAO import IMPORT_COLUMNS, _upsert_sql
+
+
+@pytest.mark.parametrize('columns', [IMPORT_COLUMNS, ('customer_name',)])
+def test_upsert_is_batched_by_driver(columns):
+    """VALUES 中全是占位符时 pymysql 才把 executemany 合并为多行 INSERT，否则逐行执行"""
+    sql = _upsert_sql(columns)
+    match = RE_INSERT_VALUES.match(sql)
+    assert match
+    assert match.group(2).count('%s') == len(columns) + 4
+    assert 'ON DUPLICATE KEY UPDATE' in match.group(3)
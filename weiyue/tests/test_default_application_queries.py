@@ -0,0 +1,23 @@
+from dao.DefaultApplicationDAO import _get_reviews_query, _reviews_query, _enriched_query
+
+
+def test_get_reviews_filters_in_where_clause():
+    sql, params = _get_reviews_query(['DEF001', 'DEF002'])
+    # ID 条件必须在 WHERE 中，拼在 LEFT JOIN 的 ON 条件后面时不会过滤任何行
+    assert 'WHERE da.app_id IN (%s, %s)' in sql
+    assert sql.count('WHERE') == 1
+    assert params == ['DEF001', 'DEF002']
+
+
+def test_reviews_query_has_single_where():
+    sql, params = _reviews_query(None, '待审核', None, None, None, 20, None)
+    assert sql.count('WHERE') == 1
+    assert 'WHERE 1=1 AND da.audit_status = %s' in sql
+    assert params == ['待审核', 20]
+
+
+def test_enriched_query_accepts_customer_id_list():
+    sql, params = _enriched_query(None, None, None, None, None, None, None, ['C1', 'C2', 'C1'])
+    assert 'da.customer_id IN (%s, %s)' in sql
+    assert params == ['C1', 'C2']
+    assert _enriched_query(None, None, None, None, None, None, None, []) is None
@@ -0,0 +1,17 @@
+"""DAO 热点查询的执行计划回归测试：需要执行过 db.schema 迁移的 MySQL，连不上时跳过"""
+import pytest
+
+from db.explain_check import QUERIES, check_query, clear_caches, describe, mysql_available
+
+pytestmark = pytest.mark.skipif(not mysql_available(), reason="MySQL 不可用")
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    clear_caches()
+
+
+@pytest.mark.parametrize("name, call", QUERIES, ids=[name for name, _ in QUERIES])
+def test_no_full_table_scan(name, call):
+    problems = check_query(name, call)
+    assert not problems, "\n".join(describe(problem) for problem in problems)
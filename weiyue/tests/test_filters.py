@@ -0,0 +1,34 @@
+from dao.DefaultApplicationDAO import _list_with_filters_query as default_list_query
+from dao.RecoveryApplicationDAO import _list_with_filters_query as recovery_list_query
+from dao.RecoveryApplicationDAO import _enriched_query as recovery_enriched_query
+
+CURSOR = ['2024-01-01 00:00:00', 'X001']
+
+
+def test_plain_filters_do_not_join():
+    for build in (default_list_query, recovery_list_query):
+        sql, params = build(None, '待审核', '2024-01-01', None, None, 20, None, None)
+        assert ' JOIN ' not in sql
+        assert params == ['待审核', '2024-01-01 00:00:00', 20]
+
+
+def test_name_and_reviewer_filters_join():
+    sql, params = recovery_list_query('a', None, None, None, '张', None, None, None)
+    assert 'JOIN t_customer_info ci ON ra.customer_id = ci.customer_id' in sql
+    assert 'JOIN t_user_info ui ON ra.auditor_id = ui.user_id' in sql
+    assert params == ['%a%', '%张%']
+
+
+def test_recovery_and_default_share_filter_shape():
+    default_sql, default_params = default_list_query(None, '同意', None, None, None, 10, CURSOR, ['C1', 'C2'])
+    recovery_sql, recovery_params = recovery_list_query(None, '同意', None, None, None, 10, CURSOR, ['C1', 'C2'])
+    assert default_params == recovery_params
+    assert recovery_sql == (
+        default_sql.replace('t_default_application', 't_recovery_application')
+        .replace('da.app_id', 'ra.recovery_app_id').replace('da.', 'ra.').replace(' da', ' ra')
+    )
+
+
+def test_empty_customer_id_list_matches_nothing():
+    assert recovery_list_query(None, None, None, None, None, None, None, []) is None
+    assert recovery_enriched_query(None, None, None, None, None, None, None, []) is None
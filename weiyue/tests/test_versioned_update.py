@@ -0,0 +1,63 @@
+import pytest
+
+from db.base import ConflictError, Database
+
+
+class RecordingDatabase(Database):
+    """不连接数据库：SELECT ... FOR UPDATE 返回 current 中的行，记录执行的 UPDATE"""
+
+    def __init__(self, current, rowcount=None):
+        super().__init__()
+        self.current = current
+        self.rowcount = rowcount
+        self.updates = []
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        if sql.strip().startswith('SELECT'):
+            self._rows = [row for row in self.current if row['id'] in params]
+        else:
+            self.updates.append((sql, params))
+        return True, None
+
+    def fetchall(self):
+        return self._rows
+
+    def get_rowcount(self):
+        return self.rowcount if self.rowcount is not None else len(self.updates[-1][1]) // 2
+
+
+def row(app_id, version, matched=1):
+    return {'id': app_id, 'version': version, 'matched': matched}
+
+
+def update(db, versions):
+    return db.update_versioned_in(
+        "t_default_application", "app_id", versions, "audit_status = %s", ['同意'],
+        condition="audit_status = '待审核'", chunk_size=2
+    )
+
+
+def test_updates_by_id_and_version():
+    db = RecordingDatabase([row('A', 1), row('B', 2), row('C', 0)])
+    assert update(db, {'A': 1, 'B': 2, 'C': 0}) == (True, None)
+    assert len(db.updates) == 2
+    sql, params = db.updates[0]
+    assert "(app_id, version) IN ((%s, %s), (%s, %s)) AND audit_status = '待审核'" in sql
+    assert 'version = version + 1' in sql
+    assert params == ['同意', 'A', 1, 'B', 2]
+
+
+def test_conflicts_are_reported_and_nothing_is_updated():
+    # B 的版本号已变化，C 已审核，D 已不存在
+    db = RecordingDatabase([row('A', 1), row('B', 3), row('C', 0, matched=0)])
+    with pytest.raises(ConflictError) as info:
+        update(db, {'A': 1, 'B': 2, 'C': 0, 'D': 0})
+    assert info.value.ids == ['B', 'C', 'D']
+    assert db.updates == []
+
+
+def test_rowcount_short_of_chunk_is_a_conflict():
+    db = RecordingDatabase([row('A', 1), row('B', 2)], rowcount=1)
+    with pytest.raises(ConflictError):
+        update(db, {'A': 1, 'B': 2})